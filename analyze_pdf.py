@@ -13,27 +13,57 @@ Output:
     - Tabel detectie (locaties, kolommen)
     - Voorbeeld data (eerste 5 regels)
     - Voorstel voor template-configuratie
+
+Cache:
+    Extractie-resultaten worden opgeslagen in ~/.cache/factuurvergelijker/analyze,
+    met de inhoud-hash van de PDF (blake2b) + pdfplumber-versie als sleutel.
+    Een ongewijzigde PDF wordt bij een volgende run niet opnieuw geparsed.
 """
 
 import sys
 from pathlib import Path
 import json
-
-try:
-    import pdfplumber
-    PDFPLUMBER_AVAILABLE = True
-except ImportError:
-    PDFPLUMBER_AVAILABLE = False
+import hashlib
+from dataclasses import dataclass
+from importlib.util import find_spec
+
+# Alleen controleren óf de libraries er zijn; importeren gebeurt pas bij
+# gebruik (tabula probeert bij import al een JVM te vinden).
+PDFPLUMBER_AVAILABLE = find_spec("pdfplumber") is not None
+if not PDFPLUMBER_AVAILABLE:
     print("⚠️ pdfplumber niet geïnstalleerd. Installeer met: pip install pdfplumber")
 
-try:
-    import tabula
-    TABULA_AVAILABLE = True
-except ImportError:
-    TABULA_AVAILABLE = False
+TABULA_AVAILABLE = find_spec("tabula") is not None
+if not TABULA_AVAILABLE:
     print("⚠️ tabula-py niet geïnstalleerd. Installeer met: pip install tabula-py")
 
 
+CACHE_DIR = Path.home() / '.cache' / 'factuurvergelijker' / 'analyze'
+
+# Heuristiek voor kolom-mapping: keyword (substring van header) → canonieke kolom.
+# Volgorde is prioriteit: eerste keyword dat in de header voorkomt wint.
+HEADER_MAP = {}
+HEADER_MAP.update({kw: "artikelcode" for kw in ('code', 'artikel', 'sku')})
+HEADER_MAP.update({kw: "artikelnaam" for kw in ('naam', 'omschrijving', 'description', 'product')})
+HEADER_MAP.update({kw: "aantal" for kw in ('aantal', 'qty', 'quantity', 'hoeveelheid')})
+HEADER_MAP.update({kw: "prijs_per_stuk" for kw in ('prijs', 'price', 'stukprijs', 'unit')})
+HEADER_MAP.update({kw: "totaal" for kw in ('totaal', 'total', 'bedrag', 'amount')})
+
+
+@dataclass(frozen=True)
+class TabelVorm:
+    """Afmetingen van de eerste tabel op een pagina (0 als er geen is)."""
+    n_tabellen: int
+    n_rijen: int
+    n_kolommen: int
+
+    @classmethod
+    def van_tabellen(cls, tabellen: list) -> 'TabelVorm':
+        n_rijen = len(tabellen[0]) if tabellen else 0
+        n_kolommen = len(tabellen[0][0]) if n_rijen else 0
+        return cls(len(tabellen or []), n_rijen, n_kolommen)
+
+
 def analyseer_pdf(pdf_pad: Path):
     """
     Analyseer PDF en genereer rapport.
@@ -60,142 +90,154 @@ def analyseer_pdf(pdf_pad: Path):
         print("❌ Kan PDF niet analyseren (pdfplumber ontbreekt)")
         return
 
+    # Extractie: uit cache, of PDF één keer openen en parsen. De cachesleutel
+    # leest het bestand al, dus leesfouten hier net zo melden als bij openen
     try:
-        with pdfplumber.open(pdf_pad) as pdf:
-            aantal_paginas = len(pdf.pages)
-            print(f"   Aantal pagina's: {aantal_paginas}")
-
-            # Lees eerste pagina
-            eerste_pagina = pdf.pages[0]
-            tekst = eerste_pagina.extract_text()
-
-            if tekst:
-                print(f"   ✅ Text-based PDF (tekst extracteerbaar)")
-                print(f"   Tekst lengte: {len(tekst)} karakters")
-            else:
-                print(f"   ❌ GEEN tekst geëxtraheerd (mogelijk gescanned)")
-                print(f"   🛑 NO-GO: Scans worden niet ondersteund")
-                return
-
-            # Toon eerste 200 karakters (voor identifier detectie)
-            print(f"\n   📝 Eerste 200 karakters:")
-            print(f"   {repr(tekst[:200])}")
-
-    except Exception as e:
+        cache_pad = _cache_pad(pdf_pad)
+    except OSError as e:
         print(f"❌ Fout bij openen PDF: {e}")
         return
+    analyse = _laad_uit_cache(cache_pad)
+
+    if analyse is not None:
+        print(f"   ♻️ Extractie uit cache geladen ({cache_pad.name})")
+    else:
+        try:
+            analyse = _extraheer_pdfplumber(pdf_pad)
+        except Exception as e:
+            print(f"❌ Fout bij openen PDF: {e}")
+            return
+
+        # Tabula (JVM-start + tweede parse) alleen als fallback
+        if analyse['tekst'] and not _tabel_bruikbaar(analyse['tabellen_per_pagina']):
+            analyse['tabula'] = _extraheer_tabula(pdf_pad)
+        else:
+            analyse['tabula'] = None
+
+        # Alleen foutloze extracties cachen
+        if analyse['tabel_fout'] is None and not (analyse['tabula'] or {}).get('fout'):
+            _schrijf_naar_cache(cache_pad, analyse)
+
+    aantal_paginas = analyse['aantal_paginas']
+    tekst = analyse['tekst']
+    tabellen_per_pagina = analyse['tabellen_per_pagina']
+    tabellen_p1 = tabellen_per_pagina[0] if tabellen_per_pagina else []
+    pdfplumber_tabellen_ok = _tabel_bruikbaar(tabellen_per_pagina)
+
+    print(f"   Aantal pagina's: {aantal_paginas}")
+
+    if tekst:
+        print(f"   ✅ Text-based PDF (tekst extracteerbaar)")
+        print(f"   Tekst lengte: {len(tekst)} karakters")
+    else:
+        print(f"   ❌ GEEN tekst geëxtraheerd (mogelijk gescanned)")
+        print(f"   🛑 NO-GO: Scans worden niet ondersteund")
+        return
+
+    # Toon eerste 200 karakters (voor identifier detectie)
+    print(f"\n   📝 Eerste 200 karakters:")
+    print(f"   {repr(tekst[:200])}")
 
     # SECTIE 2: TABEL DETECTIE (pdfplumber)
     print(f"\n\n2️⃣ TABEL DETECTIE (pdfplumber)")
     print("-" * 40)
 
-    try:
-        with pdfplumber.open(pdf_pad) as pdf:
-            for pagina_nr, pagina in enumerate(pdf.pages[:3], 1):  # Max 3 pagina's
-                print(f"\n   📄 Pagina {pagina_nr}:")
-
-                # Detecteer tabellen
-                tabellen = pagina.extract_tables()
-                print(f"   Aantal tabellen gevonden: {len(tabellen)}")
-
-                if tabellen:
-                    for tabel_nr, tabel in enumerate(tabellen, 1):
-                        print(f"\n   📊 Tabel {tabel_nr}:")
-                        print(f"      Rijen: {len(tabel)}")
-                        print(f"      Kolommen: {len(tabel[0]) if tabel else 0}")
-
-                        # Toon headers
-                        if len(tabel) > 0:
-                            print(f"      Headers: {tabel[0]}")
-
-                        # Toon eerste 3 data rijen
-                        if len(tabel) > 1:
-                            print(f"\n      Voorbeeld data (eerste 3 rijen):")
-                            for rij in tabel[1:4]:
-                                print(f"      {rij}")
-                else:
-                    print(f"   ⚠️ Geen tabellen gedetecteerd op pagina {pagina_nr}")
+    for pagina_nr, tabellen in enumerate(tabellen_per_pagina, 1):
+        print(f"\n   📄 Pagina {pagina_nr}:")
+        if pagina_nr in analyse.get('scan_paginas', []):
+            print(f"   ⏭️ Pagina {pagina_nr} lijkt scan, tabellen overgeslagen")
+            continue
+        print(f"   Aantal tabellen gevonden: {len(tabellen)}")
 
-    except Exception as e:
-        print(f"   ❌ Fout bij tabel detectie: {e}")
+        if tabellen:
+            for tabel_nr, tabel in enumerate(tabellen, 1):
+                print(f"\n   📊 Tabel {tabel_nr}:")
+                print(f"      Rijen: {len(tabel)}")
+                print(f"      Kolommen: {len(tabel[0]) if tabel else 0}")
+
+                # Toon headers
+                if len(tabel) > 0:
+                    print(f"      Headers: {tabel[0]}")
+
+                # Toon eerste 3 data rijen
+                if len(tabel) > 1:
+                    print(f"\n      Voorbeeld data (eerste 3 rijen):")
+                    for rij in tabel[1:4]:
+                        print(f"      {rij}")
+        else:
+            print(f"   ⚠️ Geen tabellen gedetecteerd op pagina {pagina_nr}")
+
+    if analyse['tabel_fout']:
+        print(f"   ❌ Fout bij tabel detectie: {analyse['tabel_fout']}")
 
     # SECTIE 3: TABEL DETECTIE (tabula - alternatief)
-    if TABULA_AVAILABLE:
+    if TABULA_AVAILABLE and pdfplumber_tabellen_ok:
         print(f"\n\n3️⃣ TABEL DETECTIE (tabula - alternatief)")
         print("-" * 40)
+        print(f"   ⏭️ pdfplumber resultaat voldoende — tabula overgeslagen")
 
-        try:
-            tabellen_tabula = tabula.read_pdf(
-                str(pdf_pad),
-                pages='1',
-                multiple_tables=True
-            )
+    elif analyse['tabula'] is not None:
+        print(f"\n\n3️⃣ TABEL DETECTIE (tabula - alternatief)")
+        print("-" * 40)
+
+        if analyse['tabula']['fout']:
+            print(f"   ❌ Tabula fout: {analyse['tabula']['fout']}")
+        else:
+            tabellen_tabula = analyse['tabula']['tabellen']
 
             print(f"   Aantal tabellen gevonden: {len(tabellen_tabula)}")
 
-            for tabel_nr, df in enumerate(tabellen_tabula, 1):
+            for tabel_nr, tabel in enumerate(tabellen_tabula, 1):
                 print(f"\n   📊 Tabel {tabel_nr}:")
-                print(f"      Shape: {df.shape}")
-                print(f"      Kolommen: {list(df.columns)}")
+                print(f"      Shape: {tuple(tabel['shape'])}")
+                print(f"      Kolommen: {tabel['kolommen']}")
                 print(f"\n      Eerste 3 rijen:")
-                print(df.head(3).to_string(index=False))
-
-        except Exception as e:
-            print(f"   ❌ Tabula fout: {e}")
+                print(tabel['voorbeeld'])
 
     # SECTIE 4: VOORSTEL TEMPLATE
     print(f"\n\n4️⃣ VOORSTEL TEMPLATE-CONFIGURATIE")
     print("-" * 40)
 
-    # Genereer basis template
+    # Genereer basis template (op basis van tabellen van pagina 1)
     try:
-        with pdfplumber.open(pdf_pad) as pdf:
-            eerste_pagina = pdf.pages[0]
-            tekst = eerste_pagina.extract_text()
-            tabellen = eerste_pagina.extract_tables()
-
-            if tabellen:
-                eerste_tabel = tabellen[0]
-
-                template = {
-                    "identifier_regex": "TODO: zoek unieke string in PDF",
-                    "parser_type": "pdfplumber",  # of "tabula"
-                    "aantal_paginas": len(pdf.pages),
-                    "kolom_mapping": {},
-                    "validatie": {
-                        "min_regels": max(1, len(eerste_tabel) - 1),
-                        "vereist_totaalbedrag": True
-                    }
+        tabellen = tabellen_p1
+
+        if tabellen:
+            eerste_tabel = tabellen[0]
+
+            template = {
+                "identifier_regex": "TODO: zoek unieke string in PDF",
+                "parser_type": "pdfplumber",  # of "tabula"
+                "aantal_paginas": aantal_paginas,
+                "kolom_mapping": {},
+                "validatie": {
+                    "min_regels": max(1, len(eerste_tabel) - 1),
+                    "vereist_totaalbedrag": True
                 }
-
-                # Probeer kolommen te mappen
-                if len(eerste_tabel) > 0:
-                    headers = eerste_tabel[0]
-                    for idx, header in enumerate(headers):
-                        if header:
-                            header_lower = str(header).lower().strip()
-
-                            # Heuristiek voor mapping
-                            if any(x in header_lower for x in ['code', 'artikel', 'sku']):
-                                template["kolom_mapping"][idx] = "artikelcode"
-                            elif any(x in header_lower for x in ['naam', 'omschrijving', 'description', 'product']):
-                                template["kolom_mapping"][idx] = "artikelnaam"
-                            elif any(x in header_lower for x in ['aantal', 'qty', 'quantity', 'hoeveelheid']):
-                                template["kolom_mapping"][idx] = "aantal"
-                            elif any(x in header_lower for x in ['prijs', 'price', 'stukprijs', 'unit']):
-                                template["kolom_mapping"][idx] = "prijs_per_stuk"
-                            elif any(x in header_lower for x in ['totaal', 'total', 'bedrag', 'amount']):
-                                template["kolom_mapping"][idx] = "totaal"
-
-                print(f"\n   Voorgestelde configuratie (DRAFT):")
-                print(f"   {json.dumps(template, indent=4)}")
-
-                print(f"\n   ⚠️ LET OP:")
-                print(f"   - identifier_regex moet handmatig ingevuld")
-                print(f"   - Kolom-mapping controleren en aanpassen")
-                print(f"   - Testen met meerdere PDF's van deze leverancier")
-            else:
-                print(f"   ⚠️ Geen tabel gevonden, kan geen template genereren")
+            }
+
+            # Probeer kolommen te mappen
+            if len(eerste_tabel) > 0:
+                headers = eerste_tabel[0]
+                for idx, header in enumerate(headers):
+                    if header:
+                        header_lower = str(header).lower().strip()
+
+                        # Heuristiek voor mapping (zie HEADER_MAP)
+                        for keyword, canonieke_naam in HEADER_MAP.items():
+                            if keyword in header_lower:
+                                template["kolom_mapping"][idx] = canonieke_naam
+                                break
+
+            print(f"\n   Voorgestelde configuratie (DRAFT):")
+            print(f"   {json.dumps(template, indent=4)}")
+
+            print(f"\n   ⚠️ LET OP:")
+            print(f"   - identifier_regex moet handmatig ingevuld")
+            print(f"   - Kolom-mapping controleren en aanpassen")
+            print(f"   - Testen met meerdere PDF's van deze leverancier")
+        else:
+            print(f"   ⚠️ Geen tabel gevonden, kan geen template genereren")
 
     except Exception as e:
         print(f"   ❌ Fout bij template generatie: {e}")
@@ -205,55 +247,52 @@ def analyseer_pdf(pdf_pad: Path):
     print("-" * 40)
 
     try:
-        with pdfplumber.open(pdf_pad) as pdf:
-            eerste_pagina = pdf.pages[0]
-            tekst = eerste_pagina.extract_text()
-            tabellen = eerste_pagina.extract_tables()
-
-            score = 0
-            redenen = []
-
-            # Check 1: Text-based
-            if tekst:
-                score += 3
-                redenen.append("✅ Text-based PDF")
-            else:
-                redenen.append("❌ Geen tekst (scan)")
-
-            # Check 2: Tabellen detecteerbaar
-            if tabellen and len(tabellen) > 0:
-                score += 3
-                redenen.append(f"✅ Tabel gevonden ({len(tabellen[0])} rijen)")
-            else:
-                redenen.append("❌ Geen tabel gedetecteerd")
-
-            # Check 3: Kolommen logisch
-            if tabellen and len(tabellen[0]) > 0 and len(tabellen[0][0]) >= 3:
-                score += 2
-                redenen.append(f"✅ Voldoende kolommen ({len(tabellen[0][0])})")
-            else:
-                redenen.append("⚠️ Te weinig kolommen")
-
-            # Check 4: Data rijen aanwezig
-            if tabellen and len(tabellen[0]) > 1:
-                score += 2
-                redenen.append(f"✅ Data rijen aanwezig ({len(tabellen[0]) - 1})")
-            else:
-                redenen.append("❌ Geen data rijen")
-
-            # Beslissing
-            print(f"   Score: {score}/10")
-            print(f"\n   Redenen:")
-            for reden in redenen:
-                print(f"   {reden}")
-
-            print(f"\n   📊 CONCLUSIE:")
-            if score >= 8:
-                print(f"   ✅ GO - Hoge confidence, template is haalbaar")
-            elif score >= 5:
-                print(f"   ⚠️ GO MET RISICO - Middel confidence, handmatige checks nodig")
-            else:
-                print(f"   ❌ NO-GO - Te laag confidence, niet geschikt voor template")
+        vorm = TabelVorm.van_tabellen(tabellen_p1)
+
+        score = 0
+        redenen = []
+
+        # Check 1: Text-based
+        if tekst:
+            score += 3
+            redenen.append("✅ Text-based PDF")
+        else:
+            redenen.append("❌ Geen tekst (scan)")
+
+        # Check 2: Tabellen detecteerbaar
+        if vorm.n_tabellen > 0:
+            score += 3
+            redenen.append(f"✅ Tabel gevonden ({vorm.n_rijen} rijen)")
+        else:
+            redenen.append("❌ Geen tabel gedetecteerd")
+
+        # Check 3: Kolommen logisch
+        if vorm.n_kolommen >= 3:
+            score += 2
+            redenen.append(f"✅ Voldoende kolommen ({vorm.n_kolommen})")
+        else:
+            redenen.append("⚠️ Te weinig kolommen")
+
+        # Check 4: Data rijen aanwezig
+        if vorm.n_rijen > 1:
+            score += 2
+            redenen.append(f"✅ Data rijen aanwezig ({vorm.n_rijen - 1})")
+        else:
+            redenen.append("❌ Geen data rijen")
+
+        # Beslissing
+        print(f"   Score: {score}/10")
+        print(f"\n   Redenen:")
+        for reden in redenen:
+            print(f"   {reden}")
+
+        print(f"\n   📊 CONCLUSIE:")
+        if score >= 8:
+            print(f"   ✅ GO - Hoge confidence, template is haalbaar")
+        elif score >= 5:
+            print(f"   ⚠️ GO MET RISICO - Middel confidence, handmatige checks nodig")
+        else:
+            print(f"   ❌ NO-GO - Te laag confidence, niet geschikt voor template")
 
     except Exception as e:
         print(f"   ❌ Fout bij go/no-go analyse: {e}")
@@ -261,6 +300,161 @@ def analyseer_pdf(pdf_pad: Path):
     print(f"\n{'='*60}\n")
 
 
+# ============================================================================
+# EXTRACTIE
+# ============================================================================
+
+def _extraheer_pdfplumber(pdf_pad: Path) -> dict:
+    """
+    Opent de PDF één keer en extraheert tekst en tabellen.
+
+    Parameters
+    ----------
+    pdf_pad : Path
+        Pad naar PDF-bestand.
+
+    Returns
+    -------
+    dict
+        {
+            'aantal_paginas': int,
+            'tekst': str of None (tekst van pagina 1),
+            'tabellen_per_pagina': [tabellen pagina 1, ...] (max 3 pagina's),
+            'scan_paginas': [paginanummers zonder tekst, tabellen overgeslagen],
+            'tabel_fout': str of None
+        }
+
+    Raises
+    ------
+    Exception
+        Als de PDF niet geopend kan worden.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(pdf_pad) as pdf:
+        analyse = {
+            'aantal_paginas': len(pdf.pages),
+            'tekst': pdf.pages[0].extract_text(),
+            'tabellen_per_pagina': [],
+            'scan_paginas': [],
+            'tabel_fout': None,
+        }
+
+        # Gescande PDF: tabel detectie heeft geen zin
+        if not analyse['tekst']:
+            return analyse
+
+        # Bewust sequentieel: pdfminer is pure Python (houdt de GIL vast) en
+        # de pagina's delen één parser, dus een thread pool levert niets op.
+        # Per-pagina processen met eigen handle waren bij 3 factuurpagina's
+        # trager dan dit (opstart + opnieuw openen > extractietijd).
+        try:
+            for pagina_nr, pagina in enumerate(pdf.pages[:3], 1):  # Max 3 pagina's
+                # Scan-pagina (geen tekst): extract_tables levert niets op
+                # maar kost wel het decoderen van de afbeeldingen
+                if pagina_nr > 1 and not pagina.extract_text():
+                    analyse['scan_paginas'].append(pagina_nr)
+                    analyse['tabellen_per_pagina'].append([])
+                    continue
+                analyse['tabellen_per_pagina'].append(pagina.extract_tables())
+        except Exception as e:
+            analyse['tabel_fout'] = str(e)
+
+    return analyse
+
+
+def _tabel_bruikbaar(tabellen_per_pagina: list) -> bool:
+    """
+    Bepaalt of pdfplumber op pagina 1 een bruikbare tabel vond
+    (header + minimaal 1 data rij, minimaal 3 kolommen).
+
+    In dat geval is tabula als alternatief overbodig.
+    """
+    if not tabellen_per_pagina:
+        return False
+
+    vorm = TabelVorm.van_tabellen(tabellen_per_pagina[0])
+    return vorm.n_rijen > 1 and vorm.n_kolommen >= 3
+
+
+def _extraheer_tabula(pdf_pad: Path) -> dict:
+    """
+    Tabel detectie met tabula (alternatief voor pdfplumber).
+
+    Parameters
+    ----------
+    pdf_pad : Path
+        Pad naar PDF-bestand.
+
+    Returns
+    -------
+    dict or None
+        {'tabellen': [{'shape', 'kolommen', 'voorbeeld'}, ...], 'fout': str of None},
+        of None als tabula niet geïnstalleerd is.
+    """
+    if not TABULA_AVAILABLE:
+        return None
+
+    import tabula
+
+    try:
+        tabellen_tabula = tabula.read_pdf(
+            str(pdf_pad),
+            pages='1',
+            multiple_tables=True
+        )
+    except Exception as e:
+        return {'tabellen': [], 'fout': str(e)}
+
+    return {
+        'tabellen': [
+            {
+                'shape': list(df.shape),
+                'kolommen': [str(kolom) for kolom in df.columns],
+                'voorbeeld': df.head(3).to_string(index=False),
+            }
+            for df in tabellen_tabula
+        ],
+        'fout': None,
+    }
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def _cache_pad(pdf_pad: Path) -> Path:
+    """
+    Bepaalt cachebestand voor een PDF.
+
+    Sleutel = blake2b-hash van de PDF-inhoud + pdfplumber-versie,
+    zodat een library-upgrade oude resultaten ongeldig maakt.
+    """
+    import pdfplumber
+
+    sleutel = hashlib.blake2b(pdf_pad.read_bytes(), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{sleutel}_pdfplumber-{pdfplumber.__version__}.json"
+
+
+def _laad_uit_cache(cache_pad: Path):
+    """Laadt gecachte extractie, of None als niet (bruikbaar) aanwezig."""
+    try:
+        with open(cache_pad, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _schrijf_naar_cache(cache_pad: Path, analyse: dict) -> None:
+    """Schrijft extractie naar cache. Fouten zijn niet fataal (cache is optioneel)."""
+    try:
+        cache_pad.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_pad, 'w', encoding='utf-8') as f:
+            json.dump(analyse, f, ensure_ascii=False)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Gebruik: python analyze_pdf.py pad/naar/bestand.pdf")
@@ -20,28 +20,25 @@ Doelgroep:
 import streamlit as st
 import pandas as pd
 from pathlib import Path
+import io
+import hashlib
 import tempfile
 import time
 from datetime import datetime
+from collections import OrderedDict
 
 # Import alle backend modules
 from modules.data_reader import lees_csv, inspecteer_csv
 from modules.data_validator import valideer_dataframe
 from modules.normalizer import normaliseer_dataframe
 from modules.comparator import vergelijk_facturen
-from modules.reporter import genereer_samenvatting, exporteer_naar_excel
+from modules.reporter import genereer_samenvatting, exporteer_naar_excel_bytes
 from modules.logger import configureer_logger, log_vergelijking_start, log_vergelijking_resultaat, log_pdf_conversie
-from modules.formatter import formatteer_aantal, formatteer_prijs
-from modules.pdf_converter import (
-    detecteer_leverancier,
-    converteer_pdf_naar_df,
-    LeverancierOnbekendError,
-    PDFParseError,
-    PDFValidatieError
-)
-from modules.pdf_classifier import classificeer_pdf
-from modules.document_classifier import classificeer_document
+from modules.formatter import formatteer_aantal_kolom, formatteer_prijs_kolom
 from modules.aggregator import aggregeer_documenten, AggregatieResultaat
+from modules import pdf_cache
+# PDF-modules (pdfplumber/tabula) worden pas geïmporteerd in de
+# verwerkingsfuncties, zodat de eerste paginaweergave ze niet hoeft te laden.
 import config
 
 
@@ -61,155 +58,311 @@ if 'logger' not in st.session_state:
     log_dir.mkdir(exist_ok=True)
     st.session_state.logger = configureer_logger(log_dir)
 
+# Achtergrondkleur per status in de resultatentabel
+STATUS_CSS = {
+    config.STATUS_OK: 'background-color: #c6efce',
+    config.STATUS_AFWIJKING: 'background-color: #ffcc99',
+    config.STATUS_ONTBREEKT_FACTUUR: 'background-color: #ffc7ce',
+    config.STATUS_ONTBREEKT_SYSTEEM: 'background-color: #ffc7ce',
+    config.STATUS_GEDEELTELIJK: 'background-color: #ffeb9c',
+}
+STATUS_CSS_ONBEKEND = 'background-color: #d9d9d9'
+
+# Icoon per documentrol in de documentdetails (overig: 📋)
+ROL_EMOJI = {'pakbon': '📦', 'factuur': '📄'}
+
+# Statusmeldingen bij de vergelijkingsknop
+BERICHT_BEIDE_KANTEN = "✅ Beide kanten hebben documenten ({systeem} systeem, {leverancier} leverancier)"
+BERICHT_UPLOAD_BEIDE_KANTEN = "⚠️ Upload eerst documenten aan beide kanten voordat u kunt vergelijken"
+
+# Detailtabel toont maximaal dit aantal regels (rest via Excel-download).
+# De Styler (HTML per cel, kleurcodering + Nederlandse notatie) rendert alleen
+# deze regels, dus blijft ook bij grote resultaten goedkoop
+TABEL_MAX_REGELS = 100
+
 
 # ============================================================================
 # HELPER FUNCTIES
 # ============================================================================
 
-def verwerk_bestand(uploaded_file, bestandstype_label: str):
+def _upload_buffer(inhoud: bytes, bestandsnaam: str) -> io.BytesIO:
+    """
+    In-memory buffer van een upload, met .name zodat readers de extensie zien.
+
+    Vervangt het wegschrijven naar een tijdelijk bestand: pdfplumber, pandas
+    en de classifiers lezen direct uit de buffer.
+    """
+    buffer = io.BytesIO(inhoud)
+    buffer.name = bestandsnaam
+    return buffer
+
+
+# Classificatie en PDF-parsing gecached op bestandsinhoud: Streamlit voert het
+# script bij elke interactie opnieuw uit, dezelfde upload wordt dan niet
+# opnieuw geparsed. Excepties worden niet gecached.
+# PDF-resultaten gaan daarnaast naar een schijfcache (modules.pdf_cache),
+# zodat dezelfde factuur ook in een latere sessie niet opnieuw wordt geparsed.
+
+@st.cache_data(max_entries=64, ttl=3600, show_spinner=False)
+def _classificeer_document_upload(inhoud: bytes, bestandsnaam: str):
+    from modules.document_classifier import classificeer_document, DocumentClassificatieResultaat
+
+    if Path(bestandsnaam).suffix.lower() != '.pdf':
+        return classificeer_document(_upload_buffer(inhoud, bestandsnaam))
+
+    sleutel = pdf_cache.cache_sleutel(inhoud, 'document')
+    classificatie = pdf_cache.laad_classificatie(sleutel, DocumentClassificatieResultaat)
+    if classificatie is None:
+        classificatie = classificeer_document(_upload_buffer(inhoud, bestandsnaam))
+        pdf_cache.bewaar_classificatie(sleutel, classificatie)
+    return classificatie
+
+
+@st.cache_data(max_entries=64, ttl=3600, show_spinner=False)
+def _classificeer_pdf_upload(inhoud: bytes, bestandsnaam: str):
+    from modules.pdf_classifier import classificeer_pdf, PDFClassificatieResultaat
+
+    sleutel = pdf_cache.cache_sleutel(inhoud, 'pdf')
+    classificatie = pdf_cache.laad_classificatie(sleutel, PDFClassificatieResultaat)
+    if classificatie is None:
+        classificatie = classificeer_pdf(_upload_buffer(inhoud, bestandsnaam))
+        pdf_cache.bewaar_classificatie(sleutel, classificatie)
+    return classificatie
+
+
+@st.cache_data(max_entries=64, ttl=3600, show_spinner=False)
+def _converteer_pdf_upload(inhoud: bytes, bestandsnaam: str, leverancier: str) -> pd.DataFrame:
+    from modules.pdf_converter import converteer_pdf_naar_df
+
+    sleutel = pdf_cache.cache_sleutel(inhoud, leverancier)
+    df = pdf_cache.laad_dataframe(sleutel)
+    if df is None:
+        df = converteer_pdf_naar_df(_upload_buffer(inhoud, bestandsnaam), leverancier)
+        pdf_cache.bewaar_dataframe(sleutel, df)
+    return df
+
+
+# Eindresultaat per document (df_norm, classificatie) per sessie: een
+# opnieuw geüpload identiek bestand slaat classificatie, parsing,
+# normalisatie en validatie volledig over. LRU, begrensd voor geheugen.
+DOCUMENT_CACHE_MAX = 32
+
+
+def _document_cache_sleutel(inhoud: bytes, groep_naam: str) -> str:
+    """Inhoud-hash (BLAKE2b) per groep; normalisatie hangt af van de groep."""
+    return f"{groep_naam}:{hashlib.blake2b(inhoud, digest_size=16).hexdigest()}"
+
+
+def _document_cache() -> OrderedDict:
+    return st.session_state.setdefault('_doc_cache', OrderedDict())
+
+
+def _dataframe_hash(df: pd.DataFrame) -> str:
+    """Exacte inhoud-hash (Streamlit hasht grote DataFrames op een steekproef)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((list(df.columns), [str(t) for t in df.dtypes])).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+# Aggregatie en vergelijking gememoiseerd: een herhaalde klik op "Vergelijk"
+# met dezelfde documenten rekent niets opnieuw uit. De aggregatie is
+# gesleuteld op de inhoud-sleutels van de documenten (df_list zelf wordt
+# niet gehasht, vandaar de underscore).
+
+@st.cache_data(max_entries=16, ttl=3600, show_spinner=False)
+def _aggregeer_documenten_cached(
+    document_sleutels: tuple,
+    document_namen: tuple,
+    document_rollen: tuple,
+    _df_list: list
+) -> AggregatieResultaat:
+    return aggregeer_documenten(
+        df_list=_df_list,
+        document_namen=list(document_namen),
+        document_rollen=list(document_rollen)
+    )
+
+
+@st.cache_data(
+    max_entries=16, ttl=3600, show_spinner=False,
+    hash_funcs={pd.DataFrame: _dataframe_hash}
+)
+def _vergelijk_en_vat_samen(df_systeem: pd.DataFrame, df_leverancier: pd.DataFrame):
+    df_resultaat = vergelijk_facturen(df_systeem, df_leverancier)
+    return df_resultaat, genereer_samenvatting(df_resultaat)
+
+
+def _verwerk_pdf(inhoud: bytes, bestandsnaam: str, bestandstype_label: str, classificatie=None):
+    """PDF: classificatie → vriendelijke melding of template-parsing (zie verwerk_bestand)."""
+    # ✨ v1.2.2: PDF pre-classificatie voor vriendelijke UX
+    st.info(f"📄 PDF gedetecteerd: {bestandsnaam}")
+
+    # Pre-classificatie (voordat volledige parsing plaatsvindt)
+    if classificatie is None or classificatie.type is None:
+        with st.spinner('PDF wordt geanalyseerd...'):
+            classificatie = _classificeer_pdf_upload(inhoud, bestandsnaam)
+
+    # 4-way branching op basis van classificatie type
+    if classificatie.type == 'gescand':
+        # Scenario 1: Gescande PDF (image-based, geen tekst)
+        st.warning("⚠️ **Gescande PDF gedetecteerd**")
+        st.info("""
+        Deze PDF is gescand als afbeelding en bevat geen doorzoekbare tekst.
+        Automatische verwerking is niet mogelijk.
+
+        💡 **Wat kunt u doen?**
+        • Vraag uw leverancier om een digitale (niet-gescande) factuur
+        • Gebruik een CSV of Excel export in plaats van PDF
+        • Als dit een eenmalige factuur is, kunt u handmatig vergelijken
+        """)
+        log_pdf_conversie(
+            st.session_state.logger,
+            bestandsnaam,
+            None,
+            0,
+            False,
+            "Gescande PDF"
+        )
+        st.stop()
+
+    elif classificatie.type == 'text_geen_template':
+        # Scenario 2: Text-based maar geen ondersteund template
+        st.info("ℹ️ **PDF bevat artikelregels, maar geen ondersteund formaat**")
+        st.info("""
+        Deze PDF heeft wel leesbare tekst en artikelregels, maar het formaat
+        komt niet overeen met onze ondersteunde leveranciers.
+
+        💡 **Alternatief:**
+        • Exporteer de factuur naar CSV of Excel vanuit uw leverancierssysteem
+        • Stuur ons deze PDF zodat we het formaat kunnen toevoegen
+
+        📋 **Ondersteunde PDF-leveranciers:**
+        • Bosal Distribution
+        • Fource / LKQ Netherlands B.V.
+        • Kilinclar (intern systeem)
+        """)
+        log_pdf_conversie(
+            st.session_state.logger,
+            bestandsnaam,
+            None,
+            0,
+            False,
+            "Geen template"
+        )
+        st.stop()
+
+    elif classificatie.type == 'geen_artikelregels':
+        # Scenario 3: PDF zonder artikeltabel
+        st.error("❌ **Geen artikeltabel gevonden**")
+        st.info("""
+        Deze PDF lijkt geen artikelregels te bevatten. Het kan gaan om een
+        voorpagina, begeleidende brief, of samenvattingspagina.
+
+        💡 **Controleer:**
+        • Is dit de juiste pagina van de factuur?
+        • Bevat de PDF wel een gedetailleerde artikellijst?
+        • Misschien heeft u een samenvattingspagina geüpload?
+
+        Als de PDF wel artikelen bevat, neem dan contact op met support.
+        """)
+        log_pdf_conversie(
+            st.session_state.logger,
+            bestandsnaam,
+            None,
+            0,
+            False,
+            "Geen artikelen"
+        )
+        st.stop()
+
+    elif classificatie.type == 'template_herkend':
+        # Scenario 4: Success - Template herkend, parse PDF
+        leverancier = classificatie.leverancier
+        st.success(f"✅ Leverancier herkend: **{leverancier}**")
+
+        # Converteer PDF naar DataFrame
+        with st.spinner(f'PDF wordt verwerkt ({leverancier})...'):
+            df = _converteer_pdf_upload(inhoud, bestandsnaam, leverancier)
+
+            st.success(f"✅ PDF verwerkt: **{len(df)} regels** geëxtraheerd")
+
+            # Log succes
+            log_pdf_conversie(
+                st.session_state.logger,
+                bestandsnaam,
+                leverancier,
+                len(df),
+                True
+            )
+
+            return normaliseer_dataframe(df, bestandstype_label)
+
+
+def _verwerk_tabel(inhoud: bytes, bestandsnaam: str, bestandstype_label: str, classificatie=None):
+    """CSV/Excel: inlezen en normaliseren (zie verwerk_bestand)."""
+    # Direct vanuit geheugen (geen tijdelijk bestand). Normalisatie per blok:
+    # grote CSV's worden in delen gelezen en genormaliseerd, zodat de ruwe
+    # data niet in zijn geheel in geheugen staat
+    return lees_csv(
+        _upload_buffer(inhoud, bestandsnaam),
+        verwerk_deel=lambda deel: normaliseer_dataframe(deel, bestandstype_label)
+    )
+
+
+# Verwerking per bestandsextensie (gebruikt door verwerk_bestand)
+_BESTANDSTYPE_HANDLERS = {
+    '.pdf': _verwerk_pdf,
+    '.csv': _verwerk_tabel,
+    '.xlsx': _verwerk_tabel,
+    '.xls': _verwerk_tabel,
+}
+
+
+def verwerk_bestand(inhoud: bytes, bestandsnaam: str, bestandstype_label: str, classificatie=None):
     """
     Verwerkt een geüpload bestand (CSV, Excel, of PDF).
 
     Parameters
     ----------
-    uploaded_file : UploadedFile
-        Streamlit uploaded file object.
+    inhoud : bytes
+        Inhoud van het geüploade bestand (eenmalig via getvalue() opgehaald).
+    bestandsnaam : str
+        Oorspronkelijke bestandsnaam (bepaalt het bestandstype).
     bestandstype_label : str
         Label voor logging ("systeemexport" of "leveranciersfactuur").
+    classificatie : PDFClassificatieResultaat of DocumentClassificatieResultaat, optional
+        Reeds bepaalde PDF-classificatie; dan wordt de PDF niet opnieuw geclassificeerd.
 
     Returns
     -------
     pd.DataFrame
-        Verwerkte DataFrame.
+        Verwerkte en genormaliseerde DataFrame (canonieke kolommen).
 
     Raises
     ------
     Exception
         Bij fouten tijdens verwerking (met duidelijke gebruikersmelding).
     """
-    bestandsnaam = uploaded_file.name
-    bestandsextensie = Path(bestandsnaam).suffix.lower()
+    from modules.pdf_converter import (
+        LeverancierOnbekendError,
+        PDFParseError,
+        PDFValidatieError
+    )
 
-    # Sla bestand tijdelijk op
-    with tempfile.NamedTemporaryFile(delete=False, suffix=bestandsextensie) as tmp:
-        tmp.write(uploaded_file.getvalue())
-        tmp_pad = Path(tmp.name)
+    bestandsextensie = Path(bestandsnaam).suffix.lower()
 
     try:
-        # Detecteer bestandstype
-        if bestandsextensie == '.pdf':
-            # ✨ v1.2.2: PDF pre-classificatie voor vriendelijke UX
-            st.info(f"📄 PDF gedetecteerd: {bestandsnaam}")
+        # Detecteer bestandstype: dispatch op extensie
+        verwerk = _BESTANDSTYPE_HANDLERS.get(bestandsextensie)
 
-            # Pre-classificatie (voordat volledige parsing plaatsvindt)
-            with st.spinner('PDF wordt geanalyseerd...'):
-                classificatie = classificeer_pdf(tmp_pad)
-
-            # 4-way branching op basis van classificatie type
-            if classificatie.type == 'gescand':
-                # Scenario 1: Gescande PDF (image-based, geen tekst)
-                st.warning("⚠️ **Gescande PDF gedetecteerd**")
-                st.info("""
-                Deze PDF is gescand als afbeelding en bevat geen doorzoekbare tekst.
-                Automatische verwerking is niet mogelijk.
-
-                💡 **Wat kunt u doen?**
-                • Vraag uw leverancier om een digitale (niet-gescande) factuur
-                • Gebruik een CSV of Excel export in plaats van PDF
-                • Als dit een eenmalige factuur is, kunt u handmatig vergelijken
-                """)
-                log_pdf_conversie(
-                    st.session_state.logger,
-                    bestandsnaam,
-                    None,
-                    0,
-                    False,
-                    "Gescande PDF"
-                )
-                st.stop()
-
-            elif classificatie.type == 'text_geen_template':
-                # Scenario 2: Text-based maar geen ondersteund template
-                st.info("ℹ️ **PDF bevat artikelregels, maar geen ondersteund formaat**")
-                st.info("""
-                Deze PDF heeft wel leesbare tekst en artikelregels, maar het formaat
-                komt niet overeen met onze ondersteunde leveranciers.
-
-                💡 **Alternatief:**
-                • Exporteer de factuur naar CSV of Excel vanuit uw leverancierssysteem
-                • Stuur ons deze PDF zodat we het formaat kunnen toevoegen
-
-                📋 **Ondersteunde PDF-leveranciers:**
-                • Bosal Distribution
-                • Fource / LKQ Netherlands B.V.
-                • Kilinclar (intern systeem)
-                """)
-                log_pdf_conversie(
-                    st.session_state.logger,
-                    bestandsnaam,
-                    None,
-                    0,
-                    False,
-                    "Geen template"
-                )
-                st.stop()
-
-            elif classificatie.type == 'geen_artikelregels':
-                # Scenario 3: PDF zonder artikeltabel
-                st.error("❌ **Geen artikeltabel gevonden**")
-                st.info("""
-                Deze PDF lijkt geen artikelregels te bevatten. Het kan gaan om een
-                voorpagina, begeleidende brief, of samenvattingspagina.
-
-                💡 **Controleer:**
-                • Is dit de juiste pagina van de factuur?
-                • Bevat de PDF wel een gedetailleerde artikellijst?
-                • Misschien heeft u een samenvattingspagina geüpload?
-
-                Als de PDF wel artikelen bevat, neem dan contact op met support.
-                """)
-                log_pdf_conversie(
-                    st.session_state.logger,
-                    bestandsnaam,
-                    None,
-                    0,
-                    False,
-                    "Geen artikelen"
-                )
-                st.stop()
-
-            elif classificatie.type == 'template_herkend':
-                # Scenario 4: Success - Template herkend, parse PDF
-                leverancier = classificatie.leverancier
-                st.success(f"✅ Leverancier herkend: **{leverancier}**")
-
-                # Converteer PDF naar DataFrame
-                with st.spinner(f'PDF wordt verwerkt ({leverancier})...'):
-                    df = converteer_pdf_naar_df(tmp_pad, leverancier)
-
-                    st.success(f"✅ PDF verwerkt: **{len(df)} regels** geëxtraheerd")
-
-                    # Log succes
-                    log_pdf_conversie(
-                        st.session_state.logger,
-                        bestandsnaam,
-                        leverancier,
-                        len(df),
-                        True
-                    )
-
-                    return df
-
-        elif bestandsextensie in ['.csv', '.xlsx', '.xls']:
-            # CSV/Excel verwerking (bestaande functionaliteit)
-            df = lees_csv(tmp_pad)
-            return df
-
-        else:
+        if verwerk is None:
             st.error(f"❌ **Ongeldig bestandstype: {bestandsextensie}**")
             st.info("💡 Ondersteunde formaten: CSV, Excel (.xlsx), PDF")
             st.stop()
 
+        return verwerk(inhoud, bestandsnaam, bestandstype_label, classificatie)
+
     except LeverancierOnbekendError as e:
         st.error("❌ **Onbekende leverancier**")
         st.error(str(e))
@@ -277,11 +430,6 @@ def verwerk_bestand(uploaded_file, bestandstype_label: str):
         st.session_state.logger.error(f"Fout bij verwerken bestand {bestandsnaam}: {str(e)}")
         st.stop()
 
-    finally:
-        # Ruim tijdelijk bestand op
-        if tmp_pad.exists():
-            tmp_pad.unlink()
-
 
 def verwerk_document_groep(bestanden, groep_naam: str) -> AggregatieResultaat:
     """
@@ -314,25 +462,44 @@ def verwerk_document_groep(bestanden, groep_naam: str) -> AggregatieResultaat:
     # Verzamel verwerkte documenten
     df_list = []
     document_namen = []
+    document_sleutels = []
     document_rollen = []
     verwerkte_documenten_info = []
 
-    # Verwerk elk bestand
+    # Verwerk elk bestand (bewust sequentieel: st.*-aanroepen en st.stop()
+    # horen op de script-thread, en pdfplumber/pdfminer is pure Python zodat
+    # een thread pool geen winst geeft — zie ook analyze_pdf._extraheer_pdfplumber)
     for idx, uploaded_file in enumerate(bestanden, start=1):
+        # Inhoud eenmalig ophalen; classificatie en verwerking delen dezelfde bytes
+        inhoud = uploaded_file.getvalue()
         bestandsnaam = uploaded_file.name
-        bestandsextensie = Path(bestandsnaam).suffix.lower()
 
         st.write(f"**{idx}. {bestandsnaam}**")
 
-        # Sla bestand tijdelijk op voor classificatie
-        with tempfile.NamedTemporaryFile(delete=False, suffix=bestandsextensie) as tmp:
-            tmp.write(uploaded_file.getvalue())
-            tmp_pad = Path(tmp.name)
+        # Identiek document al eerder verwerkt in deze sessie → hergebruik
+        cache = _document_cache()
+        cache_sleutel = _document_cache_sleutel(inhoud, groep_naam)
+        if cache_sleutel in cache:
+            cache.move_to_end(cache_sleutel)
+            df_norm, classificatie = cache[cache_sleutel]
+
+            df_list.append(df_norm)
+            document_namen.append(bestandsnaam)
+            document_rollen.append(classificatie.rol)
+            document_sleutels.append(cache_sleutel)
+            verwerkte_documenten_info.append({
+                'naam': bestandsnaam,
+                'rol': classificatie.rol,
+                'aantal_regels': len(df_norm)
+            })
+
+            st.success(f"  ✅ **{len(df_norm)} artikelregels** (eerder verwerkt)")
+            continue
 
         try:
-            # Stap 1: Classificeer document
+            # Stap 1: Classificeer document (per inhoud gecached over reruns)
             with st.spinner(f'  → Classificeren...'):
-                classificatie = classificeer_document(tmp_pad)
+                classificatie = _classificeer_document_upload(inhoud, bestandsnaam)
 
             # Stap 2: Toon classificatie feedback (POSITIEF, geen angst-woorden)
             if classificatie.type == 'gescand':
@@ -370,24 +537,26 @@ def verwerk_document_groep(bestanden, groep_naam: str) -> AggregatieResultaat:
 
             # Stap 3: Verwerk document (reader → validator → normalizer)
             with st.spinner(f'  → Verwerken...'):
-                df = verwerk_bestand(uploaded_file, groep_naam)
-
-                # Normaliseer (als nog niet gebeurd in verwerk_bestand voor PDF)
-                df_norm = normaliseer_dataframe(df, groep_naam)
+                # verwerk_bestand levert al genormaliseerde data (CSV/Excel/PDF)
+                df_norm = verwerk_bestand(inhoud, bestandsnaam, groep_naam, classificatie=classificatie)
 
                 # Valideer genormaliseerde data
                 is_valid, fouten = valideer_dataframe(df_norm, groep_naam)
 
                 if not is_valid:
                     st.warning(f"  ⚠️ Document heeft missende gegevens — overgeslagen")
-                    for fout in fouten:
-                        st.caption(f"     • {fout}")
+                    st.caption("  \n".join(f"     • {fout}" for fout in fouten))
                     continue
 
                 # Document succesvol verwerkt
+                cache[cache_sleutel] = (df_norm, classificatie)
+                if len(cache) > DOCUMENT_CACHE_MAX:
+                    cache.popitem(last=False)
+
                 df_list.append(df_norm)
                 document_namen.append(bestandsnaam)
                 document_rollen.append(classificatie.rol)
+                document_sleutels.append(cache_sleutel)
 
                 verwerkte_documenten_info.append({
                     'naam': bestandsnaam,
@@ -402,11 +571,6 @@ def verwerk_document_groep(bestanden, groep_naam: str) -> AggregatieResultaat:
             st.session_state.logger.warning(f"Fout bij verwerken {bestandsnaam}: {str(e)}")
             continue
 
-        finally:
-            # Ruim tijdelijk bestand op
-            if tmp_pad.exists():
-                tmp_pad.unlink()
-
     # Check of er geldige documenten zijn
     if not df_list:
         st.error(f"❌ **Geen geldige {groep_naam}documenten**")
@@ -424,10 +588,11 @@ def verwerk_document_groep(bestanden, groep_naam: str) -> AggregatieResultaat:
 
     with st.spinner('Documenten worden samengevoegd...'):
         try:
-            result = aggregeer_documenten(
-                df_list=df_list,
-                document_namen=document_namen,
-                document_rollen=document_rollen
+            result = _aggregeer_documenten_cached(
+                tuple(document_sleutels),
+                tuple(document_namen),
+                tuple(document_rollen),
+                _df_list=df_list
             )
         except Exception as e:
             st.error(f"❌ Fout bij aggregeren: {str(e)}")
@@ -445,14 +610,15 @@ def verwerk_document_groep(bestanden, groep_naam: str) -> AggregatieResultaat:
     # Toon warnings (prijsverschillen, etc.)
     if result.warnings:
         with st.expander(f"⚠️ {len(result.warnings)} waarschuwing(en) — niet-blokkerend"):
-            for warning in result.warnings:
-                st.caption(f"• {warning}")
+            # Eén element in plaats van één per waarschuwing
+            st.caption("  \n".join(f"• {warning}" for warning in result.warnings))
 
     # Toon details in expander
     with st.expander("📋 Documentdetails"):
-        for info in verwerkte_documenten_info:
-            rol_emoji = "📦" if info['rol'] == 'pakbon' else "📄" if info['rol'] == 'factuur' else "📋"
-            st.caption(f"{rol_emoji} **{info['naam']}** — {info['rol']} — {info['aantal_regels']} regels")
+        st.caption("  \n".join(
+            f"{ROL_EMOJI.get(info['rol'], '📋')} **{info['naam']}** — {info['rol']} — {info['aantal_regels']} regels"
+            for info in verwerkte_documenten_info
+        ))
 
     st.divider()
 
@@ -520,16 +686,13 @@ st.divider()
 
 st.subheader("⚡ Stap 2: Vergelijk")
 
-# Check of beide kanten documenten hebben
-beide_kanten_aanwezig = (
-    bestanden_systeem is not None and len(bestanden_systeem) > 0 and
-    bestanden_factuur is not None and len(bestanden_factuur) > 0
-)
+# Check of beide kanten documenten hebben (None of lege lijst → False)
+beide_kanten_aanwezig = bool(bestanden_systeem) and bool(bestanden_factuur)
 
 if beide_kanten_aanwezig:
-    st.success(f"✅ Beide kanten hebben documenten ({len(bestanden_systeem)} systeem, {len(bestanden_factuur)} leverancier)")
+    st.success(BERICHT_BEIDE_KANTEN.format(systeem=len(bestanden_systeem), leverancier=len(bestanden_factuur)))
 else:
-    st.warning("⚠️ Upload eerst documenten aan beide kanten voordat u kunt vergelijken")
+    st.warning(BERICHT_UPLOAD_BEIDE_KANTEN)
 
 # Vergelijkingsknop
 vergelijk_knop = st.button(
@@ -583,11 +746,10 @@ if vergelijk_knop:
 
         # Voer vergelijking uit op geaggregeerde data
         with st.spinner('Geaggregeerde documenten worden vergeleken...'):
-            df_resultaat = vergelijk_facturen(
+            df_resultaat, samenvatting = _vergelijk_en_vat_samen(
                 result_systeem.df_aggregaat,
                 result_leverancier.df_aggregaat
             )
-            samenvatting = genereer_samenvatting(df_resultaat)
 
         st.success(f"✅ **Vergelijking voltooid** — {len(df_resultaat)} artikelen vergeleken")
 
@@ -595,16 +757,13 @@ if vergelijk_knop:
         # STAP 4: EXCEL RAPPORT
         # ====================================================================
         with st.spinner('Excel-rapport wordt gegenereerd...'):
-            output_dir = Path(tempfile.gettempdir()) / 'factuurvergelijker_output'
-            output_dir.mkdir(exist_ok=True)
-
             # Gebruik eerste bestandsnaam per kant voor Excel naam
             systeem_naam = result_systeem.metadata['document_namen'][0].replace('.pdf', '').replace('.csv', '')
             leverancier_naam = result_leverancier.metadata['document_namen'][0].replace('.pdf', '').replace('.csv', '')
 
-            excel_pad = exporteer_naar_excel(
+            # Direct in geheugen: geen tijdelijk bestand schrijven en teruglezen
+            excel_bytes, excel_naam = exporteer_naar_excel_bytes(
                 df_resultaat,
-                output_dir,
                 systeem_naam,
                 leverancier_naam,
                 aggregatie_systeem=result_systeem,        # v1.3 Fase 4a
@@ -617,13 +776,14 @@ if vergelijk_knop:
             st.session_state.logger,
             samenvatting,
             verwerkingstijd,
-            excel_pad
+            download_naam=excel_naam
         )
 
         # Opslaan in session state voor weergave
         st.session_state.resultaat = df_resultaat
         st.session_state.samenvatting = samenvatting
-        st.session_state.excel_pad = excel_pad
+        st.session_state.excel_bytes = excel_bytes
+        st.session_state.excel_naam = excel_naam
         st.session_state.verwerkingstijd = verwerkingstijd
         st.session_state.aggregatie_systeem = result_systeem
         st.session_state.aggregatie_leverancier = result_leverancier
@@ -676,7 +836,9 @@ if 'resultaat' in st.session_state:
     st.markdown("### 📈 Vergelijkingsresultaat")
     
     samenvatting = st.session_state.samenvatting
-    status_counts = samenvatting['status_counts']
+    # Aantallen per status in volgorde van STATUS_VOLGORDE (OK, AFWIJKING,
+    # ONTBREEKT FACTUUR, ONTBREEKT SYSTEEM, GEDEELTELIJK, FOUT)
+    counts = samenvatting['counts_array']
     
     # Metrics in kolommen
     col1, col2, col3, col4, col5, col6 = st.columns(6)
@@ -687,7 +849,7 @@ if 'resultaat' in st.session_state:
     with col2:
         st.metric(
             "✅ OK",
-            status_counts.get(config.STATUS_OK, 0),
+            int(counts[0]),
             delta=None,
             delta_color="normal"
         )
@@ -695,7 +857,7 @@ if 'resultaat' in st.session_state:
     with col3:
         st.metric(
             "⚠️ Afwijkingen",
-            status_counts.get(config.STATUS_AFWIJKING, 0),
+            int(counts[1]),
             delta=None,
             delta_color="inverse"
         )
@@ -703,23 +865,23 @@ if 'resultaat' in st.session_state:
     with col4:
         st.metric(
             "❌ Ontbreekt op factuur",
-            status_counts.get(config.STATUS_ONTBREEKT_FACTUUR, 0)
+            int(counts[2])
         )
     
     with col5:
         st.metric(
             "❌ Ontbreekt in systeem",
-            status_counts.get(config.STATUS_ONTBREEKT_SYSTEEM, 0)
+            int(counts[3])
         )
     
     with col6:
         st.metric(
             "⚡ Gedeeltelijk",
-            status_counts.get(config.STATUS_GEDEELTELIJK, 0)
+            int(counts[4])
         )
     
     # DETAILTABEL (beperkte kolommen)
-    st.markdown("### 📋 Details (eerste 100 regels)")
+    st.markdown(f"### 📋 Details (eerste {TABEL_MAX_REGELS} regels)")
     st.info("💡 **Tip:** Download het Excel-bestand hieronder voor alle details en uitgebreide informatie.")
     
     # Selecteer relevante kolommen
@@ -737,55 +899,62 @@ if 'resultaat' in st.session_state:
     # Filter kolommen die bestaan
     beschikbare_kolommen = [k for k in kolommen_tonen if k in st.session_state.resultaat.columns]
     
-    # Toon tabel (max 100 regels)
-    df_tonen = st.session_state.resultaat[beschikbare_kolommen].head(100)
+    # Toon tabel (max TABEL_MAX_REGELS regels): eerst rijen afsnijden, dan kolommen kiezen,
+    # zodat alleen het kleine stuk wordt gekopieerd
+    df_tonen = st.session_state.resultaat.iloc[:TABEL_MAX_REGELS].loc[:, beschikbare_kolommen].copy()
     
-    # Kleurcodering via styling
-    def kleur_status(val):
-        if val == config.STATUS_OK:
-            return 'background-color: #c6efce'
-        elif val == config.STATUS_AFWIJKING:
-            return 'background-color: #ffcc99'
-        elif val in [config.STATUS_ONTBREEKT_FACTUUR, config.STATUS_ONTBREEKT_SYSTEEM]:
-            return 'background-color: #ffc7ce'
-        elif val == config.STATUS_GEDEELTELIJK:
-            return 'background-color: #ffeb9c'
-        else:
-            return 'background-color: #d9d9d9'
+    aantal_kolommen = [k for k in ('aantal_systeem', 'aantal_factuur') if k in df_tonen.columns]
+    prijs_kolommen = [
+        k for k in ('prijs_systeem', 'prijs_factuur', 'totaal_systeem', 'totaal_factuur')
+        if k in df_tonen.columns
+    ]
     
-    # ✨ v1.2.2: Styling met kleurcodering EN number formatting
-    df_styled = df_tonen.style \
-        .applymap(kleur_status, subset=['status']) \
-        .format({
-            'aantal_systeem': lambda x: formatteer_aantal(x),
-            'aantal_factuur': lambda x: formatteer_aantal(x),
-            'prijs_systeem': lambda x: formatteer_prijs(x),
-            'prijs_factuur': lambda x: formatteer_prijs(x),
-            'totaal_systeem': lambda x: formatteer_prijs(x),
-            'totaal_factuur': lambda x: formatteer_prijs(x)
-        })
-
-    st.dataframe(
-        df_styled,
-        use_container_width=True,
-        height=400
-    )
+    # Kleurcodering staat standaard aan; uitzetten geeft de Arrow-weergave
+    kleuren_tonen = st.checkbox("Kleurcodering tonen", value=True, key='show_styled')
     
-    if len(st.session_state.resultaat) > 100:
-        st.warning(f"⚠️ Tabel toont eerste 100 van {len(st.session_state.resultaat)} regels. Download Excel voor alle data.")
+    if kleuren_tonen:
+        # Kleurcodering via styling: hele statuskolom in één keer mappen
+        def kleur_status(kolom: pd.Series) -> pd.Series:
+            return kolom.map(STATUS_CSS).fillna(STATUS_CSS_ONBEKEND)
+        
+        # ✨ v1.2.2: Styling met kleurcodering EN number formatting
+        # Getallen vooraf per kolom geformatteerd (gevectoriseerd), zodat de
+        # Styler geen formatter-aanroep per cel meer doet
+        df_weergave = df_tonen.assign(
+            **{k: formatteer_aantal_kolom(df_tonen[k]) for k in aantal_kolommen},
+            **{k: formatteer_prijs_kolom(df_tonen[k]) for k in prijs_kolommen}
+        )
+        df_styled = df_weergave.style.apply(kleur_status, subset=['status'])
+        
+        st.dataframe(
+            df_styled,
+            use_container_width=True,
+            height=400
+        )
+    else:
+        # Zonder Styler: Arrow-renderer, opmaak gebeurt in de browser
+        kolom_config = {'status': st.column_config.TextColumn(width='small')}
+        kolom_config.update({k: st.column_config.NumberColumn(format='%d') for k in aantal_kolommen})
+        kolom_config.update({k: st.column_config.NumberColumn(format='€%.2f') for k in prijs_kolommen})
+        
+        st.dataframe(
+            df_tonen,
+            column_config=kolom_config,
+            use_container_width=True,
+            height=400
+        )
+    
+    if len(st.session_state.resultaat) > TABEL_MAX_REGELS:
+        st.warning(f"⚠️ Tabel toont eerste {TABEL_MAX_REGELS} van {len(st.session_state.resultaat)} regels. Download Excel voor alle data.")
     
     # DOWNLOAD
     st.divider()
     st.markdown("### 📥 Download rapport")
     
-    # Lees Excel bestand
-    with open(st.session_state.excel_pad, 'rb') as f:
-        excel_data = f.read()
-    
     st.download_button(
         label="⬇️ Download Excel-rapport",
-        data=excel_data,
-        file_name=st.session_state.excel_pad.name,
+        data=st.session_state.excel_bytes,
+        file_name=st.session_state.excel_naam,
         mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
         type="primary",
         use_container_width=True
@@ -29,6 +29,8 @@ Secties:
    Standaard bestandsnamen en sheet-namen voor Excel-export.
 """
 
+from types import MappingProxyType
+
 # =============================================================================
 # TOLERANTIES (voor numerieke vergelijkingen)
 # =============================================================================
@@ -90,7 +92,8 @@ CANONIEKE_KOLOMMEN = [
 # Mogelijke leveranciersvarianten (voor automatische detectie)
 # Key = wat er in het CSV-bestand staat (lowercase)
 # Value = canonieke kolomnaam
-LEVERANCIERS_MAPPING = {
+# Alleen-lezen (MappingProxyType): wordt bij elke ingelezen header geraadpleegd
+LEVERANCIERS_MAPPING = MappingProxyType({
     # artikelcode varianten
     "artikel": CANON_ARTIKELCODE,
     "artikelcode": CANON_ARTIKELCODE,
@@ -135,7 +138,7 @@ LEVERANCIERS_MAPPING = {
     "vat": CANON_BTW,
     "tax": CANON_BTW,
     "btw%": CANON_BTW,
-}
+})
 
 # =============================================================================
 # EXPORT INSTELLINGEN
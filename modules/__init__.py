@@ -0,0 +1,15 @@
+# modules/__init__.py
+# Package met de verwerkingsstappen van de factuurvergelijker
+
+"""
+De modules importeren de centrale configuratie met `import config`.
+config.py staat in de projectmap (één niveau boven deze package); die
+wordt hier eenmalig aan sys.path toegevoegd, i.p.v. bij elke module-import.
+"""
+
+import sys
+from pathlib import Path
+
+_PROJECT_DIR = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_DIR not in sys.path:
+    sys.path.append(_PROJECT_DIR)
@@ -34,15 +34,17 @@ from dataclasses import dataclass
 from typing import List, Dict, Any
 import pandas as pd
 import numpy as np
-from pathlib import Path
-import sys
 
-# Voeg parent directory toe voor config
-sys.path.append(str(Path(__file__).parent.parent))
 import config
 
-# Hergebruik bestaande normalisatiefunctie
-from modules.normalizer import maak_genormaliseerde_naam
+# Hergebruik bestaande normalisatiefunctie (kolomversie)
+from modules.normalizer import maak_genormaliseerde_naam_kolom
+
+# Hulpkolommen waarop artikelen worden samengevoegd (code + genormaliseerde naam)
+GROEPEER_KOLOMMEN = ['_artikelcode_filled', '_artikelnaam_normalized']
+
+# Eén int64-groepsnummer per (code, naam)-combinatie; hierop wordt gegroepeerd
+GROEP_KOLOM = '_groep'
 
 
 @dataclass
@@ -174,55 +176,62 @@ def aggregeer_documenten(
         result.metadata['lege_documenten'] = lege_documenten
         return result
 
-    # Concateneer alle DataFrames
-    df_combined = pd.concat(df_list_valid, ignore_index=True)
-
-    # Filter regels met aantal = 0 of None
-    df_filtered = df_combined[
-        (df_combined[config.CANON_AANTAL].notna()) &
-        (df_combined[config.CANON_AANTAL] > 0)
-    ].copy()
+    # Filter regels met aantal = 0 of None per document, vóór de concat:
+    # alleen de regels die meetellen worden gekopieerd
+    df_list_gefilterd = [
+        df[(df[config.CANON_AANTAL].notna()) & (df[config.CANON_AANTAL] > 0)]
+        for df in df_list_valid
+    ]
 
-    if len(df_combined) - len(df_filtered) > 0:
+    aantal_overgeslagen = totaal_regels_input - sum(len(df) for df in df_list_gefilterd)
+    if aantal_overgeslagen > 0:
         warnings.append(
-            f"{len(df_combined) - len(df_filtered)} regels met aantal=0 overgeslagen"
+            f"{aantal_overgeslagen} regels met aantal=0 overgeslagen"
         )
 
+    # Concateneer alle DataFrames (eigen kopie, dus in-place toevoegen mag)
+    df_filtered = pd.concat(df_list_gefilterd, ignore_index=True)
+
+    # Groepeersleutels één keer berekenen; ook gebruikt door de prijscheck
+    _voeg_groepeersleutels_toe(df_filtered)
+
     # Detecteer prijs inconsistenties VOOR aggregatie
     prijs_warnings = _detecteer_prijs_inconsistenties(df_filtered)
     warnings.extend(prijs_warnings)
 
-    # Maak genormaliseerde artikelnaam kolom (voor grouping)
-    df_filtered['_artikelnaam_normalized'] = df_filtered[config.CANON_ARTIKELNAAM].apply(
-        maak_genormaliseerde_naam
-    )
-
-    # Group by: artikelcode + genormaliseerde artikelnaam
-    # Gebruik .fillna("") voor artikelcode om None's te groeperen
-    groupby_cols = ['_artikelcode_filled', '_artikelnaam_normalized']
-    df_filtered['_artikelcode_filled'] = df_filtered[config.CANON_ARTIKELCODE].fillna("")
+    # Group by: artikelcode + genormaliseerde artikelnaam (via groepsnummer)
+    groupby_cols = [GROEP_KOLOM]
 
-    # Aggregatie functies
+    # Aggregatie functies (ingebouwde groupby-aggregaties, geen Python-lambda per groep)
     agg_dict = {
         config.CANON_AANTAL: 'sum',
         config.CANON_TOTAAL: 'sum',
-        # Artikelnaam: eerste niet-None waarde (origineel, niet genormaliseerd)
-        config.CANON_ARTIKELNAAM: lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else None,
-        # BTW: most frequent (of None)
-        config.CANON_BTW: lambda x: x.mode().iloc[0] if len(x.mode()) > 0 and pd.notna(x.mode().iloc[0]) else None,
+        # Artikelnaam: eerste niet-None waarde (origineel, niet genormaliseerd);
+        # 'first' slaat ontbrekende waarden over
+        config.CANON_ARTIKELNAAM: 'first',
         # Artikelcode: eerste niet-None waarde
-        config.CANON_ARTIKELCODE: lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else None,
+        config.CANON_ARTIKELCODE: 'first',
     }
 
     df_aggregaat = df_filtered.groupby(groupby_cols, as_index=False).agg(agg_dict)
 
-    # Bereken weighted average prijs
+    # BTW: most frequent (of None)
+    df_aggregaat = df_aggregaat.merge(
+        _meest_voorkomende_btw(df_filtered, groupby_cols),
+        on=groupby_cols,
+        how='left'
+    )
+
+    # Bereken weighted average prijs: directe NumPy-deling, beide kolommen
+    # komen uit dezelfde groupby (geen index-alignment nodig). Aantal is na
+    # het filter altijd > 0, dus geen deling door nul.
     df_aggregaat[config.CANON_PRIJS] = (
-        df_aggregaat[config.CANON_TOTAAL] / df_aggregaat[config.CANON_AANTAL]
+        df_aggregaat[config.CANON_TOTAAL].to_numpy(dtype=np.float64)
+        / df_aggregaat[config.CANON_AANTAL].to_numpy(dtype=np.float64)
     )
 
     # Drop helper kolommen
-    df_aggregaat = df_aggregaat.drop(columns=['_artikelcode_filled', '_artikelnaam_normalized'], errors='ignore')
+    df_aggregaat = df_aggregaat.drop(columns=GROEPEER_KOLOMMEN + [GROEP_KOLOM], errors='ignore')
 
     # Zorg voor juiste kolomvolgorde
     df_aggregaat = df_aggregaat[config.CANONIEKE_KOLOMMEN]
@@ -268,11 +277,11 @@ def _aggregeer_enkel_document(
         Document zonder wijziging + metadata.
     """
 
-    # Filter regels met aantal = 0 of None
+    # Filter regels met aantal = 0 of None (boolean indexing geeft al een nieuw DataFrame)
     df_filtered = df[
         (df[config.CANON_AANTAL].notna()) &
         (df[config.CANON_AANTAL] > 0)
-    ].copy()
+    ]
 
     warnings = []
     if len(df) - len(df_filtered) > 0:
@@ -297,6 +306,66 @@ def _aggregeer_enkel_document(
     )
 
 
+def _meest_voorkomende_btw(df: pd.DataFrame, groupby_cols: List[str]) -> pd.DataFrame:
+    """
+    Meest voorkomend BTW-percentage per groep (zelfde uitkomst als Series.mode).
+
+    Bij gelijke frequentie wint het laagste percentage, net als bij mode().
+    Groepen zonder BTW-percentage komen niet voor (→ NaN na de merge).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Regels met groepeersleutels.
+    groupby_cols : List[str]
+        Groepeerkolommen.
+
+    Returns
+    -------
+    pd.DataFrame
+        groupby_cols + BTW-kolom, één rij per groep.
+    """
+    tellingen = (
+        df.dropna(subset=[config.CANON_BTW])
+        .groupby(groupby_cols + [config.CANON_BTW])
+        .size()
+        .rename('_aantal')
+        .reset_index()
+    )
+
+    return (
+        tellingen
+        .sort_values(['_aantal', config.CANON_BTW], ascending=[False, True], kind='stable')
+        .drop_duplicates(groupby_cols)
+        [groupby_cols + [config.CANON_BTW]]
+    )
+
+
+def _voeg_groepeersleutels_toe(df: pd.DataFrame) -> None:
+    """
+    Voegt de hulpkolommen voor groepering toe (in-place).
+
+    - _artikelcode_filled: artikelcode met None → "" (zodat None's groeperen)
+    - _artikelnaam_normalized: genormaliseerde artikelnaam
+    - _groep: int64-groepsnummer per (code, naam)
+
+    Code en naam worden als category opgeslagen, zodat de strings maar één
+    keer gehasht worden. _groep combineert de twee category-codes tot één
+    getal; de prijscheck, de aggregatie en de BTW-bepaling groeperen op
+    deze ene integer-kolom. Omdat de categorieën gesorteerd zijn, geeft
+    sorteren op _groep dezelfde volgorde als sorteren op (code, naam).
+    """
+    df['_artikelcode_filled'] = df[config.CANON_ARTIKELCODE].fillna("").astype('category')
+    df['_artikelnaam_normalized'] = (
+        maak_genormaliseerde_naam_kolom(df[config.CANON_ARTIKELNAAM]).astype('category')
+    )
+
+    code_nr = df['_artikelcode_filled'].cat.codes.to_numpy().astype(np.int64)
+    naam_nr = df['_artikelnaam_normalized'].cat.codes.to_numpy().astype(np.int64)
+    aantal_namen = len(df['_artikelnaam_normalized'].cat.categories)
+    df[GROEP_KOLOM] = code_nr * aantal_namen + naam_nr
+
+
 def _detecteer_prijs_inconsistenties(df: pd.DataFrame) -> List[str]:
     """
     Detecteert prijsverschillen binnen hetzelfde artikel over documenten heen.
@@ -307,7 +376,8 @@ def _detecteer_prijs_inconsistenties(df: pd.DataFrame) -> List[str]:
     Parameters
     ----------
     df : pd.DataFrame
-        Gecombineerd DataFrame (vóór aggregatie).
+        Gecombineerd DataFrame (vóór aggregatie). Als de groepeersleutels
+        (zie _voeg_groepeersleutels_toe) al aanwezig zijn, worden die gebruikt.
 
     Returns
     -------
@@ -333,43 +403,65 @@ def _detecteer_prijs_inconsistenties(df: pd.DataFrame) -> List[str]:
 
     warnings = []
 
-    # Maak genormaliseerde artikelnaam kolom
-    df_check = df.copy()
-    df_check['_artikelnaam_normalized'] = df_check[config.CANON_ARTIKELNAAM].apply(
-        maak_genormaliseerde_naam
+    # Groepeersleutels hergebruiken als de aanroeper ze al heeft toegevoegd
+    df_check = df
+    if GROEP_KOLOM not in df_check.columns:
+        df_check = df.copy()
+        _voeg_groepeersleutels_toe(df_check)
+
+    # Elk artikel maar op één regel (bijv. documenten zonder overlap):
+    # geen inconsistentie mogelijk, groupby overslaan
+    if df_check[GROEP_KOLOM].is_unique:
+        return warnings
+
+    # Group by artikel: min/max prijs in één groupby
+    per_artikel = df_check.groupby(GROEP_KOLOM).agg(
+        min_prijs=(config.CANON_PRIJS, 'min'),
+        max_prijs=(config.CANON_PRIJS, 'max'),
+        # Originele naam/code (niet genormaliseerd); 'first' slaat None over
+        naam=(config.CANON_ARTIKELNAAM, 'first'),
+        code=(config.CANON_ARTIKELCODE, 'first'),
+        sleutel_code=('_artikelcode_filled', 'first'),
     )
-    df_check['_artikelcode_filled'] = df_check[config.CANON_ARTIKELCODE].fillna("")
-
-    # Group by artikel
-    groupby_cols = ['_artikelcode_filled', '_artikelnaam_normalized']
-
-    for (code, naam_norm), group in df_check.groupby(groupby_cols):
-        # Skip als maar 1 regel (geen inconsistentie mogelijk)
-        if len(group) <= 1:
-            continue
 
-        # Check prijsverschil
-        prijzen = group[config.CANON_PRIJS].dropna().unique()
+    # Spreiding (max - min) groter dan tolerantie. Impliceert al meer dan 1
+    # verschillende prijs, dus geen aparte nunique nodig; groepen met alleen
+    # None-prijzen geven NaN en vallen er vanzelf buiten.
+    spreiding = per_artikel['max_prijs'] - per_artikel['min_prijs']
+    afwijkend = per_artikel[spreiding > config.TOLERANTIE_PRIJS]
 
-        if len(prijzen) <= 1:
-            continue  # Alle prijzen zijn gelijk (of None)
+    if afwijkend.empty:
+        return warnings
 
-        # Check of verschil groter is dan tolerantie
-        max_prijs = prijzen.max()
-        min_prijs = prijzen.min()
-        verschil = max_prijs - min_prijs
-
-        if verschil > config.TOLERANTIE_PRIJS:
-            # Haal originele artikelnaam op (niet genormaliseerd)
-            originele_naam = group[config.CANON_ARTIKELNAAM].dropna().iloc[0]
-            originele_code = group[config.CANON_ARTIKELCODE].dropna().iloc[0] if code != "" else "zonder code"
-
-            prijzen_str = ', '.join([f"€{p:.2f}" for p in sorted(prijzen)])
+    # Gesorteerde unieke prijzen, alleen voor de afwijkende artikelen
+    prijs_regels = df_check.loc[
+        df_check[GROEP_KOLOM].isin(afwijkend.index) & df_check[config.CANON_PRIJS].notna(),
+        [GROEP_KOLOM, config.CANON_PRIJS]
+    ]
+    # Sorteren op (groep, prijs) en op de groepsgrenzen splitsen: één
+    # NumPy-lijst per artikel zonder Python-aanroep per groep. Groepen staan
+    # in dezelfde (oplopende) volgorde als afwijkend.index.
+    prijs_regels = prijs_regels.drop_duplicates().sort_values([GROEP_KOLOM, config.CANON_PRIJS])
+    groepen = prijs_regels[GROEP_KOLOM].to_numpy()
+    grenzen = np.flatnonzero(groepen[1:] != groepen[:-1]) + 1
+    prijzen_per_artikel = np.split(prijs_regels[config.CANON_PRIJS].to_numpy(), grenzen)
+
+    for code, naam, originele_code, prijzen in zip(
+        afwijkend['sleutel_code'],
+        afwijkend['naam'],
+        afwijkend['code'],
+        prijzen_per_artikel
+    ):
+        originele_naam = naam if pd.notna(naam) else "zonder naam"
+        if code == "":
+            originele_code = "zonder code"
+
+        prijzen_str = ', '.join([f"€{p:.2f}" for p in prijzen])
 
-            warnings.append(
-                f"Artikel {originele_code} ({originele_naam}) heeft verschillende "
-                f"prijzen tussen documenten ({prijzen_str}). Gemiddelde prijs gebruikt."
-            )
+        warnings.append(
+            f"Artikel {originele_code} ({originele_naam}) heeft verschillende "
+            f"prijzen tussen documenten ({prijzen_str}). Gemiddelde prijs gebruikt."
+        )
 
     return warnings
 
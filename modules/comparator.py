@@ -25,13 +25,28 @@ Output:
 import pandas as pd
 import numpy as np
 from typing import Tuple, List, Dict, Optional
-import sys
-from pathlib import Path
 
-# Voeg parent directory toe zodat config.py gevonden kan worden
-sys.path.append(str(Path(__file__).parent.parent))
 import config
 
+# Kolomversie van de naam-normalisatie (zelfde uitkomst als normaliseer_naam)
+from modules.normalizer import maak_genormaliseerde_naam_kolom
+
+# Optionele dependency: numba JIT-compileert de numerieke vergelijkingskernel
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Kolommen van het resultaat-DataFrame, in deze volgorde
+RESULTAAT_KOLOMMEN = [
+    'status', 'artikelcode', 'artikelnaam',
+    'aantal_systeem', 'aantal_factuur',
+    'prijs_systeem', 'prijs_factuur',
+    'totaal_systeem', 'totaal_factuur',
+    'btw_systeem', 'btw_factuur',
+    'afwijking_toelichting'
+]
 
 def vergelijk_facturen(df_systeem: pd.DataFrame, df_factuur: pd.DataFrame) -> pd.DataFrame:
     """
@@ -72,59 +87,41 @@ def vergelijk_facturen(df_systeem: pd.DataFrame, df_factuur: pd.DataFrame) -> pd
     # Stap 1: Match regels
     matches = match_regels(df_systeem, df_factuur)
     
-    # Stap 2: Bouw resultaten lijst
-    resultaten = []
-    
-    # Verwerk gematchte regels
-    for systeem_idx, factuur_idx in matches['gematchte_regels']:
-        systeem_row = df_systeem.iloc[systeem_idx]
-        factuur_row = df_factuur.iloc[factuur_idx]
-        
-        resultaat = vergelijk_regel(systeem_row, factuur_row)
-        resultaten.append(resultaat)
-    
-    # Verwerk niet-gematchte systeemregels
-    for systeem_idx in matches['systeem_zonder_match']:
-        systeem_row = df_systeem.iloc[systeem_idx]
-        
-        resultaat = {
-            'status': config.STATUS_ONTBREEKT_FACTUUR,
-            'artikelcode': systeem_row[config.CANON_ARTIKELCODE],
-            'artikelnaam': systeem_row[config.CANON_ARTIKELNAAM],
-            'aantal_systeem': systeem_row[config.CANON_AANTAL],
-            'aantal_factuur': None,
-            'prijs_systeem': systeem_row[config.CANON_PRIJS],
-            'prijs_factuur': None,
-            'totaal_systeem': systeem_row[config.CANON_TOTAAL],
-            'totaal_factuur': None,
-            'btw_systeem': systeem_row[config.CANON_BTW],
-            'btw_factuur': None,
-            'afwijking_toelichting': 'Regel staat in systeem maar niet op factuur'
-        }
-        resultaten.append(resultaat)
-    
-    # Verwerk niet-gematchte factuurregels
-    for factuur_idx in matches['factuur_zonder_match']:
-        factuur_row = df_factuur.iloc[factuur_idx]
-        
-        resultaat = {
-            'status': config.STATUS_ONTBREEKT_SYSTEEM,
-            'artikelcode': factuur_row[config.CANON_ARTIKELCODE],
-            'artikelnaam': factuur_row[config.CANON_ARTIKELNAAM],
-            'aantal_systeem': None,
-            'aantal_factuur': factuur_row[config.CANON_AANTAL],
-            'prijs_systeem': None,
-            'prijs_factuur': factuur_row[config.CANON_PRIJS],
-            'totaal_systeem': None,
-            'totaal_factuur': factuur_row[config.CANON_TOTAAL],
-            'btw_systeem': None,
-            'btw_factuur': factuur_row[config.CANON_BTW],
-            'afwijking_toelichting': 'Regel staat op factuur maar niet in systeem'
-        }
-        resultaten.append(resultaat)
-    
-    # Converteer naar DataFrame
-    df_resultaat = pd.DataFrame(resultaten)
+    # Stap 2: Bouw resultaten kolomsgewijs op (gematcht, alleen systeem,
+    # alleen factuur); geen lijst met een dict per regel
+    # match_regels geeft index-labels; omzetten naar rijposities (zoals bij
+    # de gematchte regels), want de index hoeft geen 0..n-1 te zijn
+    systeem_pos = df_systeem.index.get_indexer(matches['systeem_zonder_match'])
+    factuur_pos = df_factuur.index.get_indexer(matches['factuur_zonder_match'])
+    gematcht = _vergelijk_gematchte_regels(df_systeem, df_factuur, matches['gematchte_regels'])
+
+    if gematcht is None and not len(systeem_pos) and not len(factuur_pos):
+        return pd.DataFrame()
+
+    blokken = []
+    if gematcht is not None:
+        blokken.append(gematcht)
+
+    # Niet-gematchte regels: kolommen één keer als array ophalen en per
+    # positie indexeren; de ontbrekende kant blijft None
+    if len(systeem_pos):
+        blokken.append(_kolommen_enkelzijdig(
+            df_systeem, systeem_pos, 'systeem', 'factuur',
+            config.STATUS_ONTBREEKT_FACTUUR,
+            'Regel staat in systeem maar niet op factuur'
+        ))
+    if len(factuur_pos):
+        blokken.append(_kolommen_enkelzijdig(
+            df_factuur, factuur_pos, 'factuur', 'systeem',
+            config.STATUS_ONTBREEKT_SYSTEEM,
+            'Regel staat op factuur maar niet in systeem'
+        ))
+
+    # Converteer naar DataFrame (dtypes afleiden zoals bij een lijst van dicts)
+    df_resultaat = pd.DataFrame({
+        kolom: np.concatenate([blok[kolom] for blok in blokken])
+        for kolom in RESULTAAT_KOLOMMEN
+    }).infer_objects()
 
     # Sorteer op status prioriteit (afwijkingen bovenaan)
     df_resultaat = _sort_by_status_priority(df_resultaat)
@@ -159,83 +156,46 @@ def match_regels(df_systeem: pd.DataFrame, df_factuur: pd.DataFrame) -> Dict[str
     """
     
     gematchte_regels = []
-    gematchte_factuur_indices = set()
-    gematchte_systeem_indices = set()
+    # Al gematchte regels als boolean masker per positie (geen sets van labels)
+    sys_gematcht = np.zeros(len(df_systeem), dtype=bool)
+    fac_gematcht = np.zeros(len(df_factuur), dtype=bool)
     
     # STAP 1: Match op artikelcode
-    for sys_idx, sys_row in df_systeem.iterrows():
-        sys_code = sys_row[config.CANON_ARTIKELCODE]
-        
-        # Skip als geen artikelcode
-        if pd.isna(sys_code) or sys_code is None:
-            continue
-        
-        # Zoek match in factuur
-        for fac_idx, fac_row in df_factuur.iterrows():
-            # Skip als al gematcht
-            if fac_idx in gematchte_factuur_indices:
-                continue
-            
-            fac_code = fac_row[config.CANON_ARTIKELCODE]
-            
-            # Skip als geen artikelcode
-            if pd.isna(fac_code) or fac_code is None:
-                continue
-            
-            # Check match
-            if str(sys_code).strip() == str(fac_code).strip():
-                gematchte_regels.append((sys_idx, fac_idx))
-                gematchte_factuur_indices.add(fac_idx)
-                gematchte_systeem_indices.add(sys_idx)
-                break  # Een systeemregel kan maar één match hebben
+    # De k-de systeemregel met een code krijgt de k-de factuurregel met
+    # dezelfde code (in volgorde van de factuur). Zelfde uitkomst als de
+    # eerste vrije match per systeemregel zoeken, maar O(N+M) i.p.v. O(N×M).
+    sys_codes = _code_sleutels(df_systeem[config.CANON_ARTIKELCODE])
+    fac_codes = _code_sleutels(df_factuur[config.CANON_ARTIKELCODE])
+    sys_pos, fac_pos = _koppel_op_volgorde(*_sleutel_ids(sys_codes, fac_codes))
+    
+    gematchte_regels.extend(zip(
+        df_systeem.index.take(sys_pos).tolist(), df_factuur.index.take(fac_pos).tolist()
+    ))
+    sys_gematcht[sys_pos] = True
+    fac_gematcht[fac_pos] = True
     
     # STAP 2: Fallback match op artikelnaam
-    for sys_idx, sys_row in df_systeem.iterrows():
-        # Skip als al gematcht
-        if sys_idx in gematchte_systeem_indices:
-            continue
-        
-        sys_naam = sys_row[config.CANON_ARTIKELNAAM]
-        
-        # Skip als geen naam
-        if pd.isna(sys_naam) or sys_naam is None:
-            continue
-        
-        # Normaliseer naam
-        sys_naam_norm = normaliseer_naam(sys_naam)
-        
-        # Skip als lege naam na normalisatie
-        if not sys_naam_norm:
-            continue
+    # Zelfde aanpak, alleen voor de regels die in stap 1 niet gematcht zijn.
+    # Hun namen worden in één keer per kolom genormaliseerd (geen naam → "").
+    sys_vrij = np.flatnonzero(~sys_gematcht)
+    fac_vrij = np.flatnonzero(~fac_gematcht)
+    
+    # Geen vrije regels aan één kant → niets te matchen, namen niet normaliseren
+    if len(sys_vrij) and len(fac_vrij):
+        sys_namen = _naam_sleutels(df_systeem[config.CANON_ARTIKELNAAM].take(sys_vrij))
+        fac_namen = _naam_sleutels(df_factuur[config.CANON_ARTIKELNAAM].take(fac_vrij))
+        sys_pos, fac_pos = _koppel_op_volgorde(*_sleutel_ids(sys_namen, fac_namen))
+        sys_pos, fac_pos = sys_vrij[sys_pos], fac_vrij[fac_pos]
         
-        # Zoek match in factuur
-        for fac_idx, fac_row in df_factuur.iterrows():
-            # Skip als al gematcht
-            if fac_idx in gematchte_factuur_indices:
-                continue
-            
-            fac_naam = fac_row[config.CANON_ARTIKELNAAM]
-            
-            # Skip als geen naam
-            if pd.isna(fac_naam) or fac_naam is None:
-                continue
-            
-            # Normaliseer naam
-            fac_naam_norm = normaliseer_naam(fac_naam)
-            
-            # Check match
-            if sys_naam_norm == fac_naam_norm and fac_naam_norm != "":
-                gematchte_regels.append((sys_idx, fac_idx))
-                gematchte_factuur_indices.add(fac_idx)
-                gematchte_systeem_indices.add(sys_idx)
-                break  # Een systeemregel kan maar één match hebben
-    
-    # STAP 3: Bepaal welke regels niet gematcht zijn
-    alle_systeem_indices = set(df_systeem.index)
-    alle_factuur_indices = set(df_factuur.index)
-    
-    systeem_zonder_match = list(alle_systeem_indices - gematchte_systeem_indices)
-    factuur_zonder_match = list(alle_factuur_indices - gematchte_factuur_indices)
+        gematchte_regels.extend(zip(
+            df_systeem.index.take(sys_pos).tolist(), df_factuur.index.take(fac_pos).tolist()
+        ))
+        sys_gematcht[sys_pos] = True
+        fac_gematcht[fac_pos] = True
+    
+    # STAP 3: Bepaal welke regels niet gematcht zijn (in volgorde van het bestand)
+    systeem_zonder_match = df_systeem.index.take(np.flatnonzero(~sys_gematcht)).tolist()
+    factuur_zonder_match = df_factuur.index.take(np.flatnonzero(~fac_gematcht)).tolist()
     
     return {
         'gematchte_regels': gematchte_regels,
@@ -244,6 +204,83 @@ def match_regels(df_systeem: pd.DataFrame, df_factuur: pd.DataFrame) -> Dict[str
     }
 
 
+def _code_sleutels(codes: pd.Series) -> np.ndarray:
+    """Matchsleutel per artikelcode: str(code).strip(), None als er geen code is."""
+    sleutels = np.full(len(codes), None, dtype=object)
+    aanwezig = codes.notna().to_numpy()
+    sleutels[aanwezig] = [str(code).strip() for code in codes.to_numpy()[aanwezig]]
+    return sleutels
+
+
+def _naam_sleutels(namen: pd.Series) -> np.ndarray:
+    """Matchsleutel per artikelnaam: genormaliseerde naam, None als die leeg is."""
+    sleutels = maak_genormaliseerde_naam_kolom(namen).to_numpy(dtype=object, copy=True)
+    sleutels[sleutels == ""] = None
+    return sleutels
+
+
+def _sleutel_ids(
+    sleutels_sys: np.ndarray,
+    sleutels_fac: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Zet sleutels van beide kanten om naar gedeelde integer-ids (geen sleutel → -1)."""
+    ids, _ = pd.factorize(np.concatenate([sleutels_sys, sleutels_fac]))
+    return ids[:len(sleutels_sys)], ids[len(sleutels_sys):]
+
+
+def _koppel_op_volgorde(
+    sys_ids: np.ndarray,
+    fac_ids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Koppelt regels met dezelfde sleutel-id op volgorde van voorkomen.
+
+    De k-de systeemregel met id s krijgt de k-de factuurregel met id s;
+    id -1 (geen sleutel) matcht nooit. Alleen integer-arrays: één stabiele
+    sortering per kant, geen Python-lus per regel.
+
+    Returns
+    -------
+    tuple
+        (systeem_posities, factuur_posities), oplopend op systeempositie.
+    """
+    n_ids = int(max(sys_ids.max(initial=-1), fac_ids.max(initial=-1))) + 1
+    if n_ids == 0:
+        leeg = np.empty(0, dtype=np.intp)
+        return leeg, leeg
+
+    fac_aantal = np.bincount(fac_ids[fac_ids >= 0], minlength=n_ids)
+    sys_aantal = np.bincount(sys_ids[sys_ids >= 0], minlength=n_ids)
+
+    # Veelvoorkomend geval: elke sleutel hooguit één keer per kant. Dan is
+    # er geen volgorde binnen een id en volstaat een opzoektabel id → positie.
+    if fac_aantal.max() <= 1 and sys_aantal.max() <= 1:
+        fac_pos_per_id = np.full(n_ids, -1, dtype=np.intp)
+        heeft_sleutel = fac_ids >= 0
+        fac_pos_per_id[fac_ids[heeft_sleutel]] = np.flatnonzero(heeft_sleutel)
+
+        kandidaat = np.where(sys_ids >= 0, fac_pos_per_id[np.maximum(sys_ids, 0)], -1)
+        sys_pos = np.flatnonzero(kandidaat >= 0)
+        return sys_pos, kandidaat[sys_pos]
+
+    # Factuurposities gegroepeerd per id (stabiel → factuurvolgorde binnen id)
+    fac_volgorde = np.argsort(fac_ids, kind='stable')
+    fac_start = np.searchsorted(fac_ids[fac_volgorde], np.arange(n_ids))
+
+    # Rangnummer van elke systeemregel binnen zijn id (0, 1, 2, ...)
+    sys_volgorde = np.argsort(sys_ids, kind='stable')
+    sys_gesorteerd = sys_ids[sys_volgorde]
+    rang = np.empty(len(sys_ids), dtype=np.intp)
+    rang[sys_volgorde] = np.arange(len(sys_ids)) - np.searchsorted(sys_gesorteerd, sys_gesorteerd)
+
+    heeft_sleutel = sys_ids >= 0
+    gematcht = heeft_sleutel & (rang < fac_aantal[np.where(heeft_sleutel, sys_ids, 0)])
+
+    sys_pos = np.flatnonzero(gematcht)
+    fac_pos = fac_volgorde[fac_start[sys_ids[sys_pos]] + rang[sys_pos]]
+    return sys_pos, fac_pos
+
+
 def normaliseer_naam(naam: str) -> str:
     """
     Normaliseert een artikelnaam voor matching.
@@ -348,10 +385,13 @@ def _detecteer_korting(row: pd.Series) -> Optional[float]:
     if not (pd.notna(prijs) and pd.notna(aantal) and pd.notna(totaal)):
         return None
 
-    prijs = float(prijs)
-    aantal = float(aantal)
-    totaal = float(totaal)
+    return _korting_percentage(float(prijs), float(aantal), float(totaal))
 
+
+def _korting_percentage(prijs: float, aantal: float, totaal: float) -> Optional[float]:
+    """
+    Kern van _detecteer_korting op losse (niet-ontbrekende) floats.
+    """
     if aantal <= 0 or prijs <= 0:
         return None
 
@@ -369,6 +409,46 @@ def _detecteer_korting(row: pd.Series) -> Optional[float]:
     return None
 
 
+def _netto_bedrag_kolom(
+    prijs: np.ndarray,
+    aantal: np.ndarray,
+    totaal: np.ndarray
+) -> np.ndarray:
+    """
+    bepaal_netto_bedrag voor uitgelijnde float64-arrays (NaN = ontbrekend).
+
+    Totaal is leidend, anders prijs × aantal; NaN waar bepaal_netto_bedrag
+    None geeft.
+    """
+    return np.where(np.isnan(totaal), prijs * aantal, totaal)
+
+def _korting_percentage_kolom(
+    prijs: np.ndarray,
+    aantal: np.ndarray,
+    totaal: np.ndarray
+) -> np.ndarray:
+    """
+    _korting_percentage voor uitgelijnde float64-arrays (NaN = ontbrekend).
+
+    Returns
+    -------
+    np.ndarray
+        Korting percentage per regel, NaN waar _korting_percentage None geeft.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bruto_bedrag = prijs * aantal
+        korting_pct = np.round((1 - totaal / bruto_bedrag) * 100, 0)
+
+    gedetecteerd = (
+        ~np.isnan(prijs + aantal + totaal)
+        & (aantal > 0) & (prijs > 0)
+        & (np.abs(bruto_bedrag - totaal) > config.TOLERANTIE_TOTAAL)
+        & (totaal < bruto_bedrag)
+    )
+
+    return np.where(gedetecteerd, korting_pct, np.nan)
+
+
 def vergelijk_regel(systeem_row: pd.Series, factuur_row: pd.Series) -> Dict:
     """
     Vergelijkt één systeemregel met één factuurregel.
@@ -445,26 +525,18 @@ def vergelijk_regel(systeem_row: pd.Series, factuur_row: pd.Series) -> Dict:
     # =========================================================================
     # STAP 4: BOUW TOELICHTING (KORTING-BEWUST)
     # =========================================================================
-    # Detecteer korting op beide kanten
-    korting_sys = _detecteer_korting(systeem_row)
-    korting_fac = _detecteer_korting(factuur_row)
-
     if afwijkingen:
         toelichting = '; '.join(afwijkingen)
-    elif not aantal_vergelijkbaar:
-        toelichting = 'Aantal kon niet worden vergeleken (ontbrekende data)'
-    elif not bedrag_vergelijkbaar:
-        toelichting = 'Bedrag kon niet worden bepaald (ontbrekende data)'
-    elif korting_sys or korting_fac:
-        # Bedrag klopt, maar er is korting gedetecteerd → meld dit
-        korting_info = []
-        if korting_sys:
-            korting_info.append(f"systeem {int(korting_sys)}%")
-        if korting_fac:
-            korting_info.append(f"factuur {int(korting_fac)}%")
-        toelichting = f"Bedrag komt overeen (korting toegepast: {', '.join(korting_info)})"
+    elif status == config.STATUS_GEDEELTELIJK:
+        # Korting wordt alleen gemeld als aantal én bedrag vergelijkbaar zijn
+        toelichting = _bouw_toelichting_zonder_afwijking(
+            aantal_vergelijkbaar, bedrag_vergelijkbaar, None, None
+        )
     else:
-        toelichting = 'Aantal en bedrag komen overeen'
+        # Detecteer korting op beide kanten (alleen nodig bij status OK)
+        toelichting = _bouw_toelichting_zonder_afwijking(
+            True, True, _detecteer_korting(systeem_row), _detecteer_korting(factuur_row)
+        )
 
     # =========================================================================
     # STAP 5: BOUW RESULTAAT
@@ -491,6 +563,243 @@ def vergelijk_regel(systeem_row: pd.Series, factuur_row: pd.Series) -> Dict:
     return resultaat
 
 
+# Vaste toelichtingen voor gematchte regels zonder afwijking
+_TOELICHTING_OK = 'Aantal en bedrag komen overeen'
+_TOELICHTING_AANTAL_ONBEKEND = 'Aantal kon niet worden vergeleken (ontbrekende data)'
+_TOELICHTING_BEDRAG_ONBEKEND = 'Bedrag kon niet worden bepaald (ontbrekende data)'
+
+
+def _bouw_toelichting_zonder_afwijking(
+    aantal_vergelijkbaar: bool,
+    bedrag_vergelijkbaar: bool,
+    korting_sys: Optional[float],
+    korting_fac: Optional[float]
+) -> str:
+    """
+    Toelichting voor een gematchte regel zonder afwijkingen (OK of GEDEELTELIJK).
+    """
+    if not aantal_vergelijkbaar:
+        return _TOELICHTING_AANTAL_ONBEKEND
+    if not bedrag_vergelijkbaar:
+        return _TOELICHTING_BEDRAG_ONBEKEND
+    if korting_sys or korting_fac:
+        # Bedrag klopt, maar er is korting gedetecteerd → meld dit
+        korting_info = []
+        if korting_sys:
+            korting_info.append(f"systeem {int(korting_sys)}%")
+        if korting_fac:
+            korting_info.append(f"factuur {int(korting_fac)}%")
+        return f"Bedrag komt overeen (korting toegepast: {', '.join(korting_info)})"
+    return _TOELICHTING_OK
+
+
+# =============================================================================
+# NUMERIEKE VERGELIJKINGSKERNEL
+# =============================================================================
+
+# Statuscodes uit de kernel → config.STATUS_* strings
+_KERNEL_AFWIJKING = 0
+_KERNEL_GEDEELTELIJK = 1
+_KERNEL_OK = 2
+_KERNEL_STATUSSEN = np.array(
+    [config.STATUS_AFWIJKING, config.STATUS_GEDEELTELIJK, config.STATUS_OK],
+    dtype=object
+)
+
+
+def _compare_kernel(
+    aantal_sys: np.ndarray,
+    aantal_fac: np.ndarray,
+    bedrag_sys: np.ndarray,
+    bedrag_fac: np.ndarray,
+    tol_aantal: float,
+    tol_totaal: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vergelijkt aantal en netto bedrag voor alle gematchte paren tegelijk.
+
+    Pure numerieke kernel op uitgelijnde float64-arrays (NaN = ontbrekend),
+    met dezelfde beslisboom als vergelijk_regel. Wordt met numba
+    gecompileerd indien beschikbaar, anders draait de NumPy-versie.
+
+    Returns
+    -------
+    tuple
+        (statuscodes int8, aantal_afwijking bool, bedrag_afwijking bool)
+    """
+    aantal_vergelijkbaar = ~(np.isnan(aantal_sys) | np.isnan(aantal_fac))
+    bedrag_vergelijkbaar = ~(np.isnan(bedrag_sys) | np.isnan(bedrag_fac))
+
+    aantal_afwijking = aantal_vergelijkbaar & (np.abs(aantal_sys - aantal_fac) > tol_aantal)
+    bedrag_afwijking = bedrag_vergelijkbaar & (np.abs(bedrag_sys - bedrag_fac) > tol_totaal)
+
+    statuscodes = np.where(
+        aantal_afwijking | bedrag_afwijking,
+        _KERNEL_AFWIJKING,
+        np.where(aantal_vergelijkbaar & bedrag_vergelijkbaar, _KERNEL_OK, _KERNEL_GEDEELTELIJK)
+    ).astype(np.int8)
+
+    return statuscodes, aantal_afwijking, bedrag_afwijking
+
+
+if NUMBA_AVAILABLE:
+    # Geen fastmath: die mag NaN negeren, en NaN betekent hier "ontbrekend"
+    _compare_kernel = njit(cache=True)(_compare_kernel)
+
+
+def _numerieke_kolom(df: pd.DataFrame, kolom: str) -> np.ndarray:
+    """Canonieke kolom als float64-array (None/ongeldig → NaN)."""
+    return pd.to_numeric(df[kolom], errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _vergelijk_gematchte_regels(
+    df_systeem: pd.DataFrame,
+    df_factuur: pd.DataFrame,
+    gematchte_regels: List[Tuple]
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Vergelijkt alle gematchte regels in één keer (zelfde uitkomst als
+    vergelijk_regel per paar).
+
+    Geeft per kolom uit RESULTAAT_KOLOMMEN een object-array terug, of None
+    als er geen gematchte regels zijn.
+
+    Kolommen worden één keer als arrays uitgelezen; de numerieke
+    vergelijking draait in _compare_kernel, de kortingsdetectie in
+    _korting_percentage_kolom, en alleen de toelichtingen worden per
+    regel in Python opgebouwd.
+    """
+    if not gematchte_regels:
+        return None
+
+    sys_labels, fac_labels = zip(*gematchte_regels)
+    sys_pos = df_systeem.index.get_indexer(sys_labels)
+    fac_pos = df_factuur.index.get_indexer(fac_labels)
+
+    def _kolommen(df, pos):
+        waarden = {
+            kolom: df[kolom].to_numpy()[pos]
+            for kolom in (config.CANON_ARTIKELCODE, config.CANON_ARTIKELNAAM,
+                          config.CANON_AANTAL, config.CANON_PRIJS,
+                          config.CANON_TOTAAL, config.CANON_BTW)
+        }
+        aantal = _numerieke_kolom(df, config.CANON_AANTAL)[pos]
+        prijs = _numerieke_kolom(df, config.CANON_PRIJS)[pos]
+        totaal = _numerieke_kolom(df, config.CANON_TOTAAL)[pos]
+        return waarden, aantal, prijs, totaal, _netto_bedrag_kolom(prijs, aantal, totaal)
+
+    sys_w, aantal_sys, prijs_sys, totaal_sys, bedrag_sys = _kolommen(df_systeem, sys_pos)
+    fac_w, aantal_fac, prijs_fac, totaal_fac, bedrag_fac = _kolommen(df_factuur, fac_pos)
+
+    statuscodes, aantal_afwijking, bedrag_afwijking = _compare_kernel(
+        aantal_sys, aantal_fac, bedrag_sys, bedrag_fac,
+        float(config.TOLERANTIE_AANTAL), float(config.TOLERANTIE_TOTAAL)
+    )
+    statussen = _KERNEL_STATUSSEN[statuscodes]
+
+    # Korting voor alle paren tegelijk (alleen gebruikt zonder afwijking)
+    kortingen_sys = _korting_percentage_kolom(prijs_sys, aantal_sys, totaal_sys)
+    kortingen_fac = _korting_percentage_kolom(prijs_fac, aantal_fac, totaal_fac)
+
+    # Toelichtingen: vaste teksten per masker vullen; alleen afwijkingen en
+    # kortingen worden geformatteerd
+    n = len(sys_pos)
+    afwijking = statuscodes == _KERNEL_AFWIJKING
+    aantal_onbekend = ~afwijking & np.isnan(aantal_sys + aantal_fac)
+    bedrag_onbekend = ~afwijking & ~aantal_onbekend & np.isnan(bedrag_sys + bedrag_fac)
+    # Korting telt alleen als > 0 (zelfde als `if korting_sys or korting_fac`)
+    met_korting = (
+        ~afwijking & ~aantal_onbekend & ~bedrag_onbekend
+        & ((np.nan_to_num(kortingen_sys) != 0) | (np.nan_to_num(kortingen_fac) != 0))
+    )
+
+    toelichtingen = np.full(n, _TOELICHTING_OK, dtype=object)
+    toelichtingen[aantal_onbekend] = _TOELICHTING_AANTAL_ONBEKEND
+    toelichtingen[bedrag_onbekend] = _TOELICHTING_BEDRAG_ONBEKEND
+
+    for i in np.flatnonzero(afwijking):
+        afwijkingen = []
+        if aantal_afwijking[i]:
+            afwijkingen.append(
+                f"Aantal wijkt af (systeem {int(aantal_sys[i])}, factuur {int(aantal_fac[i])})"
+            )
+        if bedrag_afwijking[i]:
+            afwijkingen.append(
+                f"Bedrag wijkt af (systeem €{bedrag_sys[i]:.2f}, factuur €{bedrag_fac[i]:.2f})"
+            )
+        toelichtingen[i] = '; '.join(afwijkingen)
+
+    # Dezelfde kortingscombinatie komt vaak terug: tekst één keer opbouwen
+    korting_teksten = {}
+    for i in np.flatnonzero(met_korting):
+        sleutel = (
+            None if np.isnan(kortingen_sys[i]) else float(kortingen_sys[i]),
+            None if np.isnan(kortingen_fac[i]) else float(kortingen_fac[i])
+        )
+        tekst = korting_teksten.get(sleutel)
+        if tekst is None:
+            tekst = korting_teksten[sleutel] = _bouw_toelichting_zonder_afwijking(
+                True, True, *sleutel
+            )
+        toelichtingen[i] = tekst
+
+    def _eerste_gevuld(waarden_sys, waarden_fac):
+        # Zelfde als `waarde_sys or waarde_fac` per regel
+        gevuld = np.fromiter((bool(w) for w in waarden_sys), dtype=bool, count=n)
+        return np.where(gevuld, waarden_sys, waarden_fac).astype(object)
+
+    kolommen = {
+        'status': statussen,
+        'artikelcode': _eerste_gevuld(sys_w[config.CANON_ARTIKELCODE], fac_w[config.CANON_ARTIKELCODE]),
+        'artikelnaam': _eerste_gevuld(sys_w[config.CANON_ARTIKELNAAM], fac_w[config.CANON_ARTIKELNAAM]),
+        'afwijking_toelichting': toelichtingen
+    }
+    for veld, canon in (('aantal', config.CANON_AANTAL), ('prijs', config.CANON_PRIJS),
+                        ('totaal', config.CANON_TOTAAL), ('btw', config.CANON_BTW)):
+        kolommen[f'{veld}_systeem'] = sys_w[canon].astype(object)
+        kolommen[f'{veld}_factuur'] = fac_w[canon].astype(object)
+
+    return kolommen
+
+
+def _kolommen_enkelzijdig(
+    df: pd.DataFrame,
+    posities: np.ndarray,
+    kant: str,
+    andere_kant: str,
+    status: str,
+    toelichting: str
+) -> Dict[str, np.ndarray]:
+    """
+    Resultaatkolommen voor regels die maar aan één kant voorkomen.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Systeemexport of factuur waar de regels uit komen.
+    posities : np.ndarray
+        Rijposities in df (0..len(df)-1), GEEN index-labels; labels uit
+        match_regels eerst omzetten met df.index.get_indexer.
+    kant, andere_kant : str
+        'systeem' of 'factuur'; de kolommen van de andere kant blijven None.
+    status, toelichting : str
+        Vaste status en toelichting voor al deze regels.
+    """
+    n = len(posities)
+    kolommen = {
+        'status': np.full(n, status, dtype=object),
+        'artikelcode': df[config.CANON_ARTIKELCODE].to_numpy()[posities].astype(object),
+        'artikelnaam': df[config.CANON_ARTIKELNAAM].to_numpy()[posities].astype(object),
+        'afwijking_toelichting': np.full(n, toelichting, dtype=object)
+    }
+    for veld, canon in (('aantal', config.CANON_AANTAL), ('prijs', config.CANON_PRIJS),
+                        ('totaal', config.CANON_TOTAAL), ('btw', config.CANON_BTW)):
+        kolommen[f'{veld}_{kant}'] = df[canon].to_numpy()[posities].astype(object)
+        kolommen[f'{veld}_{andere_kant}'] = np.full(n, None, dtype=object)
+
+    return kolommen
+
+
 def vergelijk_tekstveld(waarde_systeem: str, waarde_factuur: str, veldnaam: str) -> Optional[str]:
     """
     Vergelijkt twee tekstvelden.
@@ -591,6 +900,8 @@ def _sort_by_status_priority(df: pd.DataFrame) -> pd.DataFrame:
     4. GEDEELTELIJK
     5. OK
     
+    Within one status the original row order is kept (stable sort).
+    
     Args:
         df: DataFrame with comparison results containing 'status' column
         
@@ -603,25 +914,19 @@ def _sort_by_status_priority(df: pd.DataFrame) -> pd.DataFrame:
     if 'status' not in df.columns:
         return df
     
-    # Gebruik de ECHTE status waarden uit config.py
-    status_priority = {
-        config.STATUS_AFWIJKING: 0,
-        config.STATUS_ONTBREEKT_FACTUUR: 1,
-        config.STATUS_ONTBREEKT_SYSTEEM: 2,
-        config.STATUS_GEDEELTELIJK: 3,
-        config.STATUS_OK: 4,
-    }
-    
-    df_sorted = df.copy()
-    df_sorted['_sort_priority'] = df_sorted['status'].map(status_priority)
-    
-    # ✅ CORRECTE PARAMETER: na_position='last' (niet na_last=True)
-    df_sorted = df_sorted.sort_values('_sort_priority', na_position='last')
-    
-    df_sorted = df_sorted.drop(columns=['_sort_priority'])
-    df_sorted = df_sorted.reset_index(drop=True)
-    
-    return df_sorted
-
-
-  
\ No newline at end of file
+    # Gebruik de ECHTE status waarden uit config.py; volgorde = prioriteit
+    status_volgorde = [
+        config.STATUS_AFWIJKING,
+        config.STATUS_ONTBREEKT_FACTUUR,
+        config.STATUS_ONTBREEKT_SYSTEEM,
+        config.STATUS_GEDEELTELIJK,
+        config.STATUS_OK,
+    ]
+    
+    # Sorteer op de integer-codes van een Categorical (geen hulpkolom, geen
+    # kopie); onbekende status (code -1) komt achteraan
+    codes = pd.Categorical(df['status'], categories=status_volgorde, ordered=True).codes
+    prioriteit = np.where(codes < 0, len(status_volgorde), codes)
+    volgorde = np.argsort(prioriteit, kind='stable')
+    
+    return df.iloc[volgorde].reset_index(drop=True)
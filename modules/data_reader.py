@@ -6,10 +6,17 @@ data_reader.py
 ==============
 
 Verantwoordelijkheid:
-    Veilig inlezen van CSV-bestanden en omzetten naar pandas DataFrame.
+    Veilig inlezen van CSV- en Excel-bestanden en omzetten naar pandas DataFrame.
 
 Functies:
-    - lees_csv: Leest CSV-bestand en retourneert DataFrame
+    - lees_csv: Leest CSV/Excel-bestand (pad of in-memory buffer) en retourneert DataFrame
+
+Parser:
+    - CSV: pyarrow.csv (multi-threaded, C++) indien beschikbaar
+    - CSV: pandas.read_csv als fallback (geen pyarrow, pyarrow kan bestand niet
+      parsen, of witruimte rond velden die alleen pandas hetzelfde wegwerkt)
+    - Grote CSV met verwerk_deel: pyarrow streaming reader, blok voor blok verwerkt
+    - Excel: calamine (Rust) indien beschikbaar, anders openpyxl
 
 Foutafhandeling:
     - Lege bestanden → ValueError
@@ -17,23 +24,71 @@ Foutafhandeling:
     - Lees/encoding problemen → IOError
 """
 
+import io
 import pandas as pd
 from pathlib import Path
-from typing import Union
-import sys
+from typing import Union, BinaryIO, Callable, Optional
+
+# pyarrow is optioneel (wordt meegeïnstalleerd met streamlit)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# python-calamine is optioneel: veel sneller dan openpyxl voor .xlsx/.xls
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+EXCEL_EXTENSIES = ('.xlsx', '.xls')
 
-# Voeg parent directory toe zodat config.py gevonden kan worden
-sys.path.append(str(Path(__file__).parent.parent))
+# Vanaf deze grootte wordt een CSV in blokken gelezen (alleen met verwerk_deel)
+GROOT_CSV_BYTES = 50 * 1024 * 1024
+CSV_BLOK_BYTES = 16 * 1024 * 1024
 
+# Standaard NA-waarden van pandas.read_csv; pyarrow krijgt dezelfde lijst,
+# zodat lege velden en 'NA', 'n/a', ... ook in tekstkolommen NaN worden
+PANDAS_NA_WAARDEN = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+    'n/a', 'nan', 'null'
+]
 
-def lees_csv(bestandspad: Union[str, Path]) -> pd.DataFrame:
+# Witruimte direct na of vóór een scheidingsteken of regelovergang. pandas
+# (skipinitialspace=True) haalt spaties aan het begin van een veld weg en
+# leest getallen met spaties/tabs eromheen als getal; pyarrow doet dat niet.
+# Zulke bestanden gaan daarom via pandas.
+_WITRUIMTE_ROND_VELD = (
+    b', ', b',\t', b' ,', b'\t,',
+    b'\n ', b'\n\t', b' \n', b'\t\n', b' \r', b'\t\r'
+)
+
+
+def lees_csv(
+    bestandspad: Union[str, Path, BinaryIO],
+    verwerk_deel: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None
+) -> pd.DataFrame:
     """
-    Leest een CSV-bestand en retourneert een pandas DataFrame.
+    Leest een CSV- of Excel-bestand en retourneert een pandas DataFrame.
+    
+    Excel wordt herkend aan de extensie (.xlsx/.xls) van het pad of van
+    het .name-attribuut van de buffer.
     
     Parameters
     ----------
-    bestandspad : str of Path
-        Pad naar het CSV-bestand dat ingelezen moet worden.
+    bestandspad : str, Path of binair file-object
+        Pad naar het bestand, of een in-memory buffer (bijv. io.BytesIO
+        met de inhoud van een upload) zodat geen tijdelijk bestand nodig is.
+    verwerk_deel : callable, optional
+        Bewerking per rij-blok (bijv. normaliseren). Grote CSV's (vanaf
+        GROOT_CSV_BYTES) worden dan in blokken gelezen en per blok verwerkt,
+        zodat de ruwe data nooit in zijn geheel als DataFrame bestaat.
+        Kleinere bestanden worden in één keer gelezen en daarna verwerkt.
+        De bewerking moet per rij werken (geen aggregatie over rijen).
     
     Returns
     -------
@@ -54,27 +109,239 @@ def lees_csv(bestandspad: Union[str, Path]) -> pd.DataFrame:
     >>> df = lees_csv("export_januari.csv")
     >>> df.shape
     (247, 6)
+    >>> df = lees_csv(io.BytesIO(uploaded_file.getvalue()))
     """
     
-    # Converteer naar Path object voor consistente afhandeling
-    pad = Path(bestandspad)
-    
-    # Controleer of bestand bestaat
-    if not pad.exists():
-        raise FileNotFoundError(f"Bestand niet gevonden: {pad}")
+    if isinstance(bestandspad, (str, Path)):
+        # Converteer naar Path object voor consistente afhandeling
+        pad = Path(bestandspad)
+        
+        # Controleer of bestand bestaat
+        if not pad.exists():
+            raise FileNotFoundError(f"Bestand niet gevonden: {pad}")
+        
+        data = pad.read_bytes()
+    else:
+        # In-memory buffer (file-like object)
+        pad = getattr(bestandspad, 'name', '<upload>')
+        data = bestandspad.read()
     
     # Controleer of bestand niet leeg is
-    if pad.stat().st_size == 0:
+    if len(data) == 0:
         raise ValueError(f"Bestand is leeg: {pad}")
     
-    # Probeer CSV in te lezen
+    if Path(str(pad)).suffix.lower() in EXCEL_EXTENSIES:
+        df = _lees_excel(data, pad)
+    else:
+        df = None
+        
+        # Grote CSV: in blokken lezen en direct verwerken
+        if verwerk_deel is not None and PYARROW_AVAILABLE and len(data) > GROOT_CSV_BYTES:
+            df = _lees_csv_pyarrow_in_blokken(data, verwerk_deel)
+            if df is not None:
+                if df.empty:
+                    raise ValueError(f"CSV-bestand bevat geen data-rijen: {pad}")
+                return df
+        
+        # Snelle route: pyarrow; bij parse-fouten terugvallen op pandas
+        if PYARROW_AVAILABLE:
+            df = _lees_csv_pyarrow(data)
+        
+        if df is None:
+            df = _lees_csv_pandas(data, pad)
+    
+    # Controleer of DataFrame rijen bevat
+    if df.empty:
+        raise ValueError(f"CSV-bestand bevat geen data-rijen: {pad}")
+    
+    # Controleer of DataFrame kolommen bevat
+    if len(df.columns) == 0:
+        raise ValueError(f"CSV-bestand bevat geen kolommen: {pad}")
+    
+    if verwerk_deel is not None:
+        df = verwerk_deel(df)
+    
+    return df
+
+
+def _lees_csv_pyarrow(data: bytes) -> Union[pd.DataFrame, None]:
+    """
+    Leest CSV-inhoud met pyarrow.csv.
+    
+    Parameters
+    ----------
+    data : bytes
+        Ruwe inhoud van het CSV-bestand.
+    
+    Returns
+    -------
+    pd.DataFrame or None
+        DataFrame (numpy-backed, zelfde dtypes als pandas), of None als pyarrow
+        het bestand niet kan parsen (bijv. geen UTF-8) of niet hetzelfde als
+        pandas zou lezen (witruimte rond velden) → pandas fallback.
+    """
+    if _heeft_witruimte_rond_velden(data):
+        return None
+    
+    def _lees(kolomtypen=None):
+        return pa_csv.read_csv(
+            io.BytesIO(data),
+            parse_options=pa_csv.ParseOptions(delimiter=','),
+            convert_options=_pyarrow_convert_opties(kolomtypen),
+        )
+    
+    try:
+        tabel = _lees()
+        
+        # Datum/tijd-kolommen opnieuw lezen als tekst (pandas herkent ze niet)
+        datumkolommen = _datumkolommen_als_tekst(tabel.schema)
+        if datumkolommen:
+            tabel = _lees(datumkolommen)
+    except pa.ArrowException:
+        return None
+    
+    # Niet-UTF-8 tekst (bijv. Latin-1) levert binary kolommen op → pandas fallback
+    if any(pa.types.is_binary(veld.type) for veld in tabel.schema):
+        return None
+    
+    return _arrow_naar_pandas(tabel)
+
+
+def _lees_csv_pyarrow_in_blokken(
+    data: bytes,
+    verwerk_deel: Callable[[pd.DataFrame], pd.DataFrame]
+) -> Union[pd.DataFrame, None]:
+    """
+    Leest CSV-inhoud blok voor blok met de streaming reader van pyarrow.
+    
+    Het schema wordt uit het eerste blok afgeleid en voor alle blokken
+    gebruikt, dus elk blok heeft dezelfde dtypes als bij één keer inlezen.
+    
+    Parameters
+    ----------
+    data : bytes
+        Ruwe inhoud van het CSV-bestand.
+    verwerk_deel : callable
+        Bewerking per blok (DataFrame → DataFrame).
+    
+    Returns
+    -------
+    pd.DataFrame or None
+        Samengevoegde verwerkte blokken, of None als pyarrow het bestand
+        niet kan parsen (bijv. geen UTF-8, of type-conflict in een later
+        blok) of er witruimte rond velden staat → aanroeper leest het
+        bestand in één keer.
+    """
+    if _heeft_witruimte_rond_velden(data):
+        return None
+    
+    delen = []
+    
+    def _open(kolomtypen=None):
+        return pa_csv.open_csv(
+            io.BytesIO(data),
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOK_BYTES),
+            parse_options=pa_csv.ParseOptions(delimiter=','),
+            convert_options=_pyarrow_convert_opties(kolomtypen),
+        )
+    
+    try:
+        reader = _open()
+        
+        # Datum/tijd-kolommen als tekst lezen (pandas herkent ze niet)
+        datumkolommen = _datumkolommen_als_tekst(reader.schema)
+        if datumkolommen:
+            reader = _open(datumkolommen)
+        
+        # Niet-UTF-8 tekst levert binary kolommen op → pandas fallback
+        if any(pa.types.is_binary(veld.type) for veld in reader.schema):
+            return None
+        
+        for blok in reader:
+            delen.append(verwerk_deel(_arrow_naar_pandas(blok)))
+    except pa.ArrowException:
+        return None
+    
+    if not delen:
+        return pd.DataFrame()
+    
+    return pd.concat(delen, ignore_index=True)
+
+
+def _pyarrow_convert_opties(kolomtypen: Optional[dict] = None) -> 'pa_csv.ConvertOptions':
+    """
+    ConvertOptions voor beide pyarrow-routes: NA-herkenning zoals pandas.
+
+    Lege velden en de standaard NA-teksten van pandas worden null, ook in
+    tekstkolommen (pyarrow laat die standaard als '' / 'NA' staan).
+    kolomtypen legt het type van losse kolommen vast (zie
+    _datumkolommen_als_tekst).
+    """
+    return pa_csv.ConvertOptions(
+        column_types=kolomtypen or {},
+        null_values=PANDAS_NA_WAARDEN,
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=True,
+    )
+
+
+def _datumkolommen_als_tekst(schema: 'pa.Schema') -> dict:
+    """
+    Kolomtypen die datum/tijd-kolommen als tekst laten lezen.
+
+    pyarrow leest ISO-datums als date/timestamp, pandas.read_csv laat ze
+    als tekst staan; dit is niet uit te zetten, dus opnieuw lezen.
+    """
+    return {veld.name: pa.string() for veld in schema if pa.types.is_temporal(veld.type)}
+
+
+def _arrow_naar_pandas(tabel) -> pd.DataFrame:
+    """
+    Arrow-tabel of -blok → DataFrame zoals pandas.read_csv het zou geven.
+
+    - Kolomnamen zonder voorloopspaties (skipinitialspace=True)
+    - Kolommen zonder enige waarde (null-type) → float64 NaN i.p.v. None
+    """
+    df = tabel.to_pandas()
+    df.columns = [str(kolom).lstrip() for kolom in df.columns]
+    
+    for positie, veld in enumerate(tabel.schema):
+        if pa.types.is_null(veld.type):
+            df.isetitem(positie, df.iloc[:, positie].astype('float64'))
+    
+    return df
+
+
+def _heeft_witruimte_rond_velden(data: bytes) -> bool:
+    """True als een veld met spatie/tab begint of eindigt (zie _WITRUIMTE_ROND_VELD)."""
+    if data[:1] in (b' ', b'\t') or data[-1:] in (b' ', b'\t'):
+        return True
+    return any(patroon in data for patroon in _WITRUIMTE_ROND_VELD)
+
+
+def _lees_csv_pandas(data: bytes, pad) -> pd.DataFrame:
+    """
+    Leest CSV-inhoud met pandas.read_csv (UTF-8, fallback Latin-1).
+    
+    Parameters
+    ----------
+    data : bytes
+        Ruwe inhoud van het CSV-bestand.
+    pad : Path or str
+        Bestandsnaam (alleen voor foutmeldingen).
+    
+    Returns
+    -------
+    pd.DataFrame
+        Ingelezen data.
+    """
     try:
         # Lees CSV met standaard instellingen
         # - Verwacht header in eerste regel
         # - Gebruikt comma als separator (standaard)
         # - Probeert automatisch encoding te detecteren
         df = pd.read_csv(
-            pad,
+            io.BytesIO(data),
             encoding='utf-8',  # Probeer eerst UTF-8
             sep=',',
             skipinitialspace=True,  # Verwijder spaties na separator
@@ -84,7 +351,7 @@ def lees_csv(bestandspad: Union[str, Path]) -> pd.DataFrame:
         # Fallback naar latin-1 encoding (vaak gebruikt in Nederlandse systemen)
         try:
             df = pd.read_csv(
-                pad,
+                io.BytesIO(data),
                 encoding='latin-1',
                 sep=',',
                 skipinitialspace=True,
@@ -101,13 +368,37 @@ def lees_csv(bestandspad: Union[str, Path]) -> pd.DataFrame:
     except Exception as e:
         raise IOError(f"Onverwachte fout bij lezen van {pad}: {e}")
     
-    # Controleer of DataFrame rijen bevat
-    if df.empty:
-        raise ValueError(f"CSV-bestand bevat geen data-rijen: {pad}")
+    return df
+
+
+def _lees_excel(data: bytes, pad) -> pd.DataFrame:
+    """
+    Leest het eerste werkblad van een Excel-bestand.
     
-    # Controleer of DataFrame kolommen bevat
-    if len(df.columns) == 0:
-        raise ValueError(f"CSV-bestand bevat geen kolommen: {pad}")
+    Parameters
+    ----------
+    data : bytes
+        Ruwe inhoud van het Excel-bestand.
+    pad : Path or str
+        Bestandsnaam (alleen voor foutmeldingen).
+    
+    Returns
+    -------
+    pd.DataFrame
+        Ingelezen data.
+    """
+    engine = 'calamine' if CALAMINE_AVAILABLE else None
+    
+    try:
+        df = pd.read_excel(io.BytesIO(data), engine=engine)
+    except ImportError as e:
+        # Bijv. .xls zonder xlrd/calamine
+        raise IOError(f"Geen Excel-engine beschikbaar voor {pad}: {e}")
+    except Exception as e:
+        raise ValueError(f"Ongeldig Excel-bestand {pad}: {e}")
+    
+    # Zelfde gedrag als skipinitialspace=True bij CSV
+    df.columns = [str(kolom).lstrip() for kolom in df.columns]
     
     return df
 
@@ -19,11 +19,7 @@ Belangrijke noot:
 
 import pandas as pd
 from typing import Tuple, List
-import sys
-from pathlib import Path
 
-# Voeg parent directory toe zodat config.py gevonden kan worden
-sys.path.append(str(Path(__file__).parent.parent))
 import config
 
 
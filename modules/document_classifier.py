@@ -28,7 +28,7 @@ Gebruik:
 """
 
 from dataclasses import dataclass
-from typing import Optional, Literal
+from typing import Optional, Literal, Union, BinaryIO
 from pathlib import Path
 import re
 
@@ -94,7 +94,7 @@ class DocumentClassificatieResultaat:
     bericht_gebruiker: str
 
 
-def classificeer_document(bestand_pad: Path) -> DocumentClassificatieResultaat:
+def classificeer_document(bestand_pad: Union[Path, BinaryIO]) -> DocumentClassificatieResultaat:
     """
     Classificeert document op basis van type en rol.
 
@@ -105,8 +105,9 @@ def classificeer_document(bestand_pad: Path) -> DocumentClassificatieResultaat:
 
     Parameters
     ----------
-    bestand_pad : Path
-        Pad naar document (PDF, CSV, of Excel).
+    bestand_pad : Path of binair file-object
+        Pad naar document (PDF, CSV, of Excel), of een in-memory buffer
+        (bijv. io.BytesIO) met een .name attribuut waaruit de extensie volgt.
 
     Returns
     -------
@@ -131,7 +132,7 @@ def classificeer_document(bestand_pad: Path) -> DocumentClassificatieResultaat:
     """
 
     # Detecteer bestandstype
-    extensie = bestand_pad.suffix.lower()
+    extensie = Path(bestand_pad.name).suffix.lower()
 
     if extensie == '.pdf':
         return _classificeer_pdf(bestand_pad)
@@ -150,7 +151,7 @@ def classificeer_document(bestand_pad: Path) -> DocumentClassificatieResultaat:
         )
 
 
-def _classificeer_pdf(pdf_pad: Path) -> DocumentClassificatieResultaat:
+def _classificeer_pdf(pdf_pad: Union[Path, BinaryIO]) -> DocumentClassificatieResultaat:
     """
     Classificeert PDF document.
 
@@ -216,7 +217,7 @@ def _classificeer_pdf(pdf_pad: Path) -> DocumentClassificatieResultaat:
     )
 
 
-def _classificeer_csv_excel(bestand_pad: Path, extensie: str) -> DocumentClassificatieResultaat:
+def _classificeer_csv_excel(bestand_pad: Union[Path, BinaryIO], extensie: str) -> DocumentClassificatieResultaat:
     """
     Classificeert CSV of Excel document.
 
@@ -241,6 +242,8 @@ def _classificeer_csv_excel(bestand_pad: Path, extensie: str) -> DocumentClassif
 
     try:
         # Lees alleen de kolomnamen (eerste rij, geen data)
+        if hasattr(bestand_pad, 'seek'):
+            bestand_pad.seek(0)
         if extensie == '.csv':
             df = pd.read_csv(bestand_pad, nrows=0)
         else:
@@ -284,7 +287,7 @@ def _classificeer_csv_excel(bestand_pad: Path, extensie: str) -> DocumentClassif
 # HELPER FUNCTIES (v1.3 - rol detectie)
 # ============================================================================
 
-def _extract_tekst_van_pdf(pdf_pad: Path) -> str:
+def _extract_tekst_van_pdf(pdf_pad: Union[Path, BinaryIO]) -> str:
     """
     Extraheert tekst van eerste pagina van PDF voor rol-detectie.
 
@@ -11,6 +11,7 @@ Verantwoordelijkheid:
 Functies:
     - formatteer_aantal: Float → Integer string (10.0 → "10")
     - formatteer_prijs: Float → Valuta string (10.80 → "€10,80")
+    - formatteer_aantal_kolom / formatteer_prijs_kolom: idem voor een hele kolom
     - formatteer_excel_kolom: Zet Excel number format per kolom
 
 Belangrijk:
@@ -19,6 +20,7 @@ Belangrijk:
 """
 
 from typing import Optional
+import numpy as np
 import pandas as pd
 
 
@@ -99,6 +101,68 @@ def formatteer_prijs(waarde: Optional[float]) -> str:
         return ""
 
 
+def formatteer_aantal_kolom(kolom: pd.Series) -> pd.Series:
+    """
+    Gevectoriseerde formatteer_aantal voor een hele kolom.
+
+    Parameters
+    ----------
+    kolom : pd.Series
+        Numerieke kolom (aantallen).
+
+    Returns
+    -------
+    pd.Series
+        Strings zonder decimalen; lege string bij NaN.
+
+    Voorbeelden
+    -----------
+    >>> formatteer_aantal_kolom(pd.Series([10.0, np.nan])).tolist()
+    ['10', '']
+    """
+    waarden = pd.to_numeric(kolom, errors='coerce')
+    geldig = np.isfinite(waarden.to_numpy(dtype='float64', na_value=np.nan))
+
+    resultaat = pd.Series('', index=kolom.index, dtype=object)
+    resultaat[geldig] = waarden[geldig].astype('int64').astype(str)
+    return resultaat
+
+
+def formatteer_prijs_kolom(kolom: pd.Series) -> pd.Series:
+    """
+    Gevectoriseerde formatteer_prijs voor een hele kolom.
+
+    Parameters
+    ----------
+    kolom : pd.Series
+        Numerieke kolom (prijzen in euro's).
+
+    Returns
+    -------
+    pd.Series
+        Valuta strings (€X.XXX,XX); lege string bij NaN.
+
+    Voorbeelden
+    -----------
+    >>> formatteer_prijs_kolom(pd.Series([1234.56, np.nan])).tolist()
+    ['€1.234,56', '']
+    """
+    waarden = pd.to_numeric(kolom, errors='coerce')
+    geldig = waarden.notna().to_numpy()
+
+    # Zelfde omzetting naar NL locale als formatteer_prijs, maar per kolom
+    nl = (
+        waarden[geldig].map('{:,.2f}'.format).astype(object)
+        .str.replace(',', 'X', regex=False)
+        .str.replace('.', ',', regex=False)
+        .str.replace('X', '.', regex=False)
+    )
+
+    resultaat = pd.Series('', index=kolom.index, dtype=object)
+    resultaat[geldig] = '€' + nl
+    return resultaat
+
+
 def formatteer_excel_kolom(worksheet, kolom_letter: str, kolom_type: str):
     """
     Zet Excel number format voor hele kolom.
@@ -157,8 +221,8 @@ def formatteer_dataframe_voor_display(df: pd.DataFrame, kolom_config: dict) -> p
     for kolom, kolom_type in kolom_config.items():
         if kolom in df_display.columns:
             if kolom_type == 'aantal':
-                df_display[kolom] = df_display[kolom].apply(formatteer_aantal)
+                df_display[kolom] = formatteer_aantal_kolom(df_display[kolom])
             elif kolom_type == 'prijs':
-                df_display[kolom] = df_display[kolom].apply(formatteer_prijs)
+                df_display[kolom] = formatteer_prijs_kolom(df_display[kolom])
 
     return df_display
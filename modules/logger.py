@@ -22,10 +22,7 @@ import logging
 from pathlib import Path
 from datetime import datetime
 from typing import Dict
-import sys
 
-# Voeg parent directory toe zodat config.py gevonden kan worden
-sys.path.append(str(Path(__file__).parent.parent))
 import config
 
 
@@ -157,7 +154,8 @@ def log_vergelijking_resultaat(
     logger: logging.Logger,
     samenvatting: Dict,
     verwerkingstijd: float,
-    output_bestand: Path = None
+    output_bestand: Path = None,
+    download_naam: str = None
 ):
     """
     Logt de resultaten van een vergelijking (privacy-proof).
@@ -171,7 +169,10 @@ def log_vergelijking_resultaat(
     verwerkingstijd : float
         Verwerkingstijd in seconden.
     output_bestand : Path, optional
-        Pad naar gegenereerd Excel-bestand.
+        Pad naar gegenereerd Excel-bestand op schijf.
+    download_naam : str, optional
+        Bestandsnaam van een Excel-rapport dat alleen in geheugen bestaat
+        (aangeboden als download, niet naar schijf geschreven).
     """
     
     logger.info("-" * 70)
@@ -196,6 +197,8 @@ def log_vergelijking_resultaat(
     
     if output_bestand:
         logger.info(f"Output bestand: {output_bestand.name}")
+    if download_naam:
+        logger.info(f"Excel-rapport (in geheugen, als download): {download_naam}")
     
     logger.info("=" * 70)
 
@@ -0,0 +1,186 @@
+# pdf_cache.py
+# Schijfcache voor geparste PDF's en classificaties
+
+"""
+pdf_cache.py
+============
+
+Verantwoordelijkheid:
+    Resultaten van PDF-parsing (DataFrame) en classificatie bewaren op schijf,
+    gesleuteld op de inhoud van het bestand. Dezelfde factuur die weken later
+    opnieuw wordt geüpload hoeft dan niet opnieuw geparsed te worden.
+
+Opslag:
+    - DataFrame → <sleutel>.parquet (zstd), vereist pyarrow
+    - Classificatie → <sleutel>.json (dataclass-velden)
+    Sleutel = blake2b(inhoud) + extra onderdelen (bijv. leverancier)
+    + CACHE_VERSIE + pdfplumber-versie, zodat parser-wijzigingen of een
+    library-upgrade oude resultaten ongeldig maken.
+
+Opruimen:
+    LRU op mtime: een treffer wordt 'aangeraakt', na elke schrijfactie
+    worden de oudste bestanden boven CACHE_MAX_BESTANDEN verwijderd.
+
+Foutafhandeling:
+    De cache is optioneel: lees- en schrijffouten worden genegeerd
+    (treffer → None, schrijven → overgeslagen).
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Type, TypeVar
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+try:
+    import pdfplumber
+    _PDFPLUMBER_VERSIE = pdfplumber.__version__
+except ImportError:
+    _PDFPLUMBER_VERSIE = 'geen'
+
+
+CACHE_DIR = Path(tempfile.gettempdir()) / 'factuurvergelijker_cache'
+CACHE_MAX_BESTANDEN = 256
+
+# Verhogen bij wijzigingen in parsing/classificatie die de uitkomst veranderen
+CACHE_VERSIE = 1
+
+T = TypeVar('T')
+
+
+def cache_sleutel(inhoud: bytes, *onderdelen: str) -> str:
+    """
+    Bepaalt de cachesleutel voor een bestand.
+
+    Parameters
+    ----------
+    inhoud : bytes
+        Inhoud van het bestand.
+    *onderdelen : str
+        Extra invoer die de uitkomst bepaalt (bijv. leverancier, soort).
+
+    Returns
+    -------
+    str
+        Bestandsnaam-veilige sleutel.
+
+    Voorbeelden
+    -----------
+    >>> cache_sleutel(b'%PDF-1.4 ...', 'Bosal')
+    '3f0c...e1_Bosal_v1_pdfplumber-0.11.4'
+    """
+    digest = hashlib.blake2b(inhoud, digest_size=16).hexdigest()
+    delen = [digest, *onderdelen, f"v{CACHE_VERSIE}", f"pdfplumber-{_PDFPLUMBER_VERSIE}"]
+    return "_".join(str(deel).replace(os.sep, '-').replace(' ', '-') for deel in delen)
+
+
+def laad_dataframe(sleutel: str) -> Optional[pd.DataFrame]:
+    """Laadt een gecachet DataFrame, of None als niet (bruikbaar) aanwezig."""
+    if not PARQUET_AVAILABLE:
+        return None
+
+    pad = CACHE_DIR / f"{sleutel}.parquet"
+    try:
+        df = pd.read_parquet(pad)
+    except Exception:
+        return None
+
+    _raak_aan(pad)
+    return df
+
+
+def bewaar_dataframe(sleutel: str, df: pd.DataFrame) -> None:
+    """Schrijft een DataFrame naar de cache. Fouten zijn niet fataal."""
+    if not PARQUET_AVAILABLE:
+        return
+
+    pad = CACHE_DIR / f"{sleutel}.parquet"
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tijdelijk = pad.with_suffix('.parquet.tmp')
+        df.to_parquet(tijdelijk, compression='zstd')
+        tijdelijk.replace(pad)
+    except Exception:
+        return
+
+    _ruim_op()
+
+
+def laad_classificatie(sleutel: str, resultaat_type: Type[T]) -> Optional[T]:
+    """
+    Laadt een gecachete classificatie.
+
+    Parameters
+    ----------
+    sleutel : str
+        Cachesleutel (zie cache_sleutel).
+    resultaat_type : dataclass type
+        Bijv. PDFClassificatieResultaat of DocumentClassificatieResultaat.
+
+    Returns
+    -------
+    resultaat_type or None
+        Classificatie, of None als niet (bruikbaar) aanwezig.
+    """
+    pad = CACHE_DIR / f"{sleutel}.json"
+    try:
+        with open(pad, 'r', encoding='utf-8') as f:
+            resultaat = resultaat_type(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+    _raak_aan(pad)
+    return resultaat
+
+
+def bewaar_classificatie(sleutel: str, resultaat) -> None:
+    """Schrijft een classificatie (dataclass) naar de cache. Fouten zijn niet fataal."""
+    pad = CACHE_DIR / f"{sleutel}.json"
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(pad, 'w', encoding='utf-8') as f:
+            json.dump(dataclasses.asdict(resultaat), f, ensure_ascii=False)
+    except (OSError, TypeError, ValueError):
+        return
+
+    _ruim_op()
+
+
+def _raak_aan(pad: Path) -> None:
+    """Markeert een treffer als recent gebruikt (LRU op mtime)."""
+    try:
+        os.utime(pad)
+    except OSError:
+        pass
+
+
+def _ruim_op() -> None:
+    """Verwijdert de minst recent gebruikte bestanden boven CACHE_MAX_BESTANDEN."""
+    try:
+        bestanden = [
+            (pad.stat().st_mtime, pad)
+            for pad in CACHE_DIR.iterdir()
+            if pad.suffix in ('.parquet', '.json')
+        ]
+    except OSError:
+        return
+
+    if len(bestanden) <= CACHE_MAX_BESTANDEN:
+        return
+
+    bestanden.sort()
+    for _, pad in bestanden[:len(bestanden) - CACHE_MAX_BESTANDEN]:
+        try:
+            pad.unlink()
+        except OSError:
+            pass
@@ -21,7 +21,7 @@ Waarom:
 """
 
 from dataclasses import dataclass
-from typing import Optional, Literal
+from typing import Optional, Literal, Union, BinaryIO
 import re
 from pathlib import Path
 
@@ -61,14 +61,15 @@ class PDFClassificatieResultaat:
     bericht_gebruiker: str
 
 
-def classificeer_pdf(pdf_pad: Path) -> PDFClassificatieResultaat:
+def classificeer_pdf(pdf_pad: Union[Path, BinaryIO]) -> PDFClassificatieResultaat:
     """
     Classificeert PDF in 4 categorieën voordat volledige parsing plaatsvindt.
 
     Parameters
     ----------
-    pdf_pad : Path
-        Pad naar PDF-bestand.
+    pdf_pad : Path of binair file-object
+        Pad naar PDF-bestand, of een in-memory buffer (bijv. io.BytesIO
+        met de inhoud van een upload) zodat geen tijdelijk bestand nodig is.
 
     Returns
     -------
@@ -139,7 +140,7 @@ def classificeer_pdf(pdf_pad: Path) -> PDFClassificatieResultaat:
     )
 
 
-def _extract_eerste_pagina_tekst(pdf_pad: Path) -> str:
+def _extract_eerste_pagina_tekst(pdf_pad: Union[Path, BinaryIO]) -> str:
     """
     Extraheert tekst van eerste pagina van PDF.
 
@@ -29,9 +29,9 @@ Foutafhandeling:
 
 import pandas as pd
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union, BinaryIO
 import re
-import sys
+from functools import lru_cache
 
 # PDF parsing libraries
 try:
@@ -46,10 +46,23 @@ try:
 except ImportError:
     TABULA_AVAILABLE = False
 
-# Voeg parent directory toe voor imports
-sys.path.append(str(Path(__file__).parent.parent))
 import config
 
+# Omschrijvingsregel die eigenlijk al een nieuwe datarij is (two_line_pattern)
+NIEUWE_DATARIJ_RE = re.compile(r'^\d+\s')
+
+
+@lru_cache(maxsize=None)
+def _compileer(patroon: str, flags: int = 0) -> re.Pattern:
+    """
+    Compileert een template-patroon één keer (per patroon + flags).
+
+    De patronen in config.PDF_LEVERANCIER_TEMPLATES zijn strings zodat
+    beheerders ze kunnen aanpassen; hier worden ze eenmalig gecompileerd
+    zodat de parse-lussen per regel direct een re.Pattern aanroepen.
+    """
+    return re.compile(patroon, flags)
+
 
 # ============================================================================
 # CUSTOM EXCEPTIONS
@@ -79,14 +92,15 @@ class PDFValidatieError(PDFConverterError):
 # HOOFDFUNCTIES
 # ============================================================================
 
-def detecteer_leverancier(pdf_pad: Path) -> Optional[str]:
+def detecteer_leverancier(pdf_pad: Union[Path, BinaryIO]) -> Optional[str]:
     """
     Detecteert welke leverancier een PDF heeft aangemaakt.
 
     Parameters
     ----------
-    pdf_pad : Path
-        Pad naar PDF-bestand.
+    pdf_pad : Path of binair file-object
+        Pad naar PDF-bestand, of een in-memory buffer (bijv. io.BytesIO
+        met de inhoud van een upload) zodat geen tijdelijk bestand nodig is.
 
     Returns
     -------
@@ -116,14 +130,14 @@ def detecteer_leverancier(pdf_pad: Path) -> Optional[str]:
     # Check elke leverancier template
     for leverancier_naam, template in config.PDF_LEVERANCIER_TEMPLATES.items():
         identifier_regex = template.get('identifier_regex')
-        if identifier_regex and re.search(identifier_regex, tekst, re.IGNORECASE):
+        if identifier_regex and _compileer(identifier_regex, re.IGNORECASE).search(tekst):
             return leverancier_naam
 
     return None
 
 
 def converteer_pdf_naar_df(
-    pdf_pad: Path,
+    pdf_pad: Union[Path, BinaryIO],
     leverancier: Optional[str] = None
 ) -> pd.DataFrame:
     """
@@ -131,8 +145,9 @@ def converteer_pdf_naar_df(
 
     Parameters
     ----------
-    pdf_pad : Path
-        Pad naar PDF-bestand.
+    pdf_pad : Path of binair file-object
+        Pad naar PDF-bestand, of een in-memory buffer (bijv. io.BytesIO
+        met de inhoud van een upload) zodat geen tijdelijk bestand nodig is.
     leverancier : str, optional
         Naam leverancier. Als None, wordt auto-detectie gebruikt.
 
@@ -162,7 +177,7 @@ def converteer_pdf_naar_df(
         leverancier = detecteer_leverancier(pdf_pad)
         if leverancier is None:
             raise LeverancierOnbekendError(
-                f"Kan leverancier niet detecteren in PDF: {pdf_pad.name}"
+                f"Kan leverancier niet detecteren in PDF: {getattr(pdf_pad, 'name', '<upload>')}"
             )
 
     # Haal template op
@@ -252,7 +267,7 @@ def valideer_pdf_extractie(
 # HELPER FUNCTIES (PARSERS)
 # ============================================================================
 
-def _parse_met_pdfplumber(pdf_pad: Path, template: Dict) -> pd.DataFrame:
+def _parse_met_pdfplumber(pdf_pad: Union[Path, BinaryIO], template: Dict) -> pd.DataFrame:
     """
     Parse PDF met pdfplumber library.
 
@@ -304,7 +319,7 @@ def _parse_met_pdfplumber(pdf_pad: Path, template: Dict) -> pd.DataFrame:
     return df
 
 
-def _parse_met_tabula(pdf_pad: Path, template: Dict) -> pd.DataFrame:
+def _parse_met_tabula(pdf_pad: Union[Path, BinaryIO], template: Dict) -> pd.DataFrame:
     """
     Parse PDF met tabula-py library.
 
@@ -325,20 +340,21 @@ def _parse_met_tabula(pdf_pad: Path, template: Dict) -> pd.DataFrame:
         raise PDFConverterError("tabula-py niet geïnstalleerd")
 
     try:
-        # Tabula leest automatisch tabellen
+        # Tabula leest automatisch tabellen (accepteert pad of file-object)
         tabel_area = template.get('tabel_area')
+        tabula_bron = pdf_pad if hasattr(pdf_pad, 'read') else str(pdf_pad)
 
         if tabel_area:
             # Tabula gebruikt andere coördinaten syntax: [top, left, bottom, right]
             dfs = tabula.read_pdf(
-                str(pdf_pad),
+                tabula_bron,
                 area=tabel_area,
                 pages=1,
                 pandas_options={'header': 0}
             )
         else:
             dfs = tabula.read_pdf(
-                str(pdf_pad),
+                tabula_bron,
                 pages=1,
                 pandas_options={'header': 0}
             )
@@ -357,7 +373,7 @@ def _parse_met_tabula(pdf_pad: Path, template: Dict) -> pd.DataFrame:
     return df
 
 
-def _parse_met_custom_text_extraction(pdf_pad: Path, template: Dict) -> pd.DataFrame:
+def _parse_met_custom_text_extraction(pdf_pad: Union[Path, BinaryIO], template: Dict) -> pd.DataFrame:
     """
     Parse PDF met custom text extraction (geen table detection).
 
@@ -417,14 +433,19 @@ def _parse_single_line_pattern(tekst: str, template: Dict) -> pd.DataFrame:
     if not line_pattern:
         raise PDFConverterError("line_pattern niet gedefinieerd in template")
 
+    # Patronen één keer compileren (buiten de regel-lus)
+    header_re = _compileer(header_pattern, re.IGNORECASE) if header_pattern else None
+    stop_re = _compileer(stop_pattern, re.IGNORECASE) if stop_pattern else None
+    line_re = _compileer(line_pattern)
+
     # Split tekst in regels
     regels = tekst.split('\n')
 
     # Zoek start van tabel (na header)
     start_idx = 0
-    if header_pattern:
+    if header_re:
         for idx, regel in enumerate(regels):
-            if re.search(header_pattern, regel, re.IGNORECASE):
+            if header_re.search(regel):
                 start_idx = idx + 1
                 break
 
@@ -432,11 +453,11 @@ def _parse_single_line_pattern(tekst: str, template: Dict) -> pd.DataFrame:
     data_regels = []
     for regel in regels[start_idx:]:
         # Check stop condition
-        if stop_pattern and re.search(stop_pattern, regel, re.IGNORECASE):
+        if stop_re and stop_re.search(regel):
             break
 
         # Probeer regel te matchen
-        match = re.match(line_pattern, regel.strip())
+        match = line_re.match(regel.strip())
         if match:
             groups = match.groups()
 
@@ -496,14 +517,18 @@ def _parse_two_line_pattern(tekst: str, template: Dict) -> pd.DataFrame:
     if not line_pattern:
         raise PDFConverterError("line_pattern niet gedefinieerd in template")
 
+    # Patronen één keer compileren (buiten de regel-lus)
+    header_re = _compileer(header_pattern, re.IGNORECASE) if header_pattern else None
+    line_re = _compileer(line_pattern)
+
     # Split tekst in regels
     regels = tekst.split('\n')
 
     # Zoek start van tabel
     start_idx = 0
-    if header_pattern:
+    if header_re:
         for idx, regel in enumerate(regels):
-            if re.search(header_pattern, regel, re.IGNORECASE):
+            if header_re.search(regel):
                 start_idx = idx + 1
                 break
 
@@ -514,7 +539,7 @@ def _parse_two_line_pattern(tekst: str, template: Dict) -> pd.DataFrame:
         regel = regels[idx].strip()
 
         # Probeer regel te matchen
-        match = re.match(line_pattern, regel)
+        match = line_re.match(regel)
         if match:
             groups = match.groups()
 
@@ -540,7 +565,7 @@ def _parse_two_line_pattern(tekst: str, template: Dict) -> pd.DataFrame:
             if idx + 1 < len(regels):
                 omschrijving = regels[idx + 1].strip()
                 # Filter lege regels en regels die starten met cijfer (nieuwe data rij)
-                if omschrijving and not re.match(r'^\d+\s', omschrijving):
+                if omschrijving and not NIEUWE_DATARIJ_RE.match(omschrijving):
                     row_data['artikelnaam'] = omschrijving
                     idx += 1  # Skip omschrijving regel
 
@@ -615,7 +640,7 @@ def _map_kolommen_naar_canonical(df: pd.DataFrame, template: Dict) -> pd.DataFra
 # HELPER FUNCTIES (v1.2 - custom text extraction)
 # ============================================================================
 
-def _extract_raw_text(pdf_pad: Path) -> str:
+def _extract_raw_text(pdf_pad: Union[Path, BinaryIO]) -> str:
     """
     Extraheert ruwe tekst uit alle pagina's van een PDF.
 
@@ -722,7 +747,7 @@ def _validate_row_format(row_data: Dict, template: Dict) -> bool:
     # Check artikelcode formaat (indien gespecificeerd)
     artikelcode_formaat = validatie.get('artikelcode_formaat')
     if artikelcode_formaat and 'artikelcode' in row_data:
-        if not re.match(artikelcode_formaat, str(row_data['artikelcode'])):
+        if not _compileer(artikelcode_formaat).match(str(row_data['artikelcode'])):
             return False
 
     # Check verplichte velden
@@ -11,19 +11,22 @@ Verantwoordelijkheid:
 Functies:
     - genereer_samenvatting: Berekent metrics per status
     - exporteer_naar_excel: Genereert Excel met 2 tabbladen (samenvatting + details)
+    - exporteer_naar_excel_bytes: Idem, in geheugen (voor download zonder tijdelijk bestand)
 
 Output:
     Excel-bestand met kleurcodering, autofilters en leesbare samenvattingen.
 """
 
+import io
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from datetime import datetime
+import logging
+import os
 import sys
 
-# Voeg parent directory toe zodat config.py gevonden kan worden
-sys.path.append(str(Path(__file__).parent.parent))
 import config
 
 # Import voor Excel styling
@@ -41,6 +44,37 @@ if TYPE_CHECKING:
     from modules.aggregator import AggregatieResultaat
 
 
+# Debug-logging van de Excel export: alleen actief met FV_DEBUG=1.
+# Handler wordt één keer geopend i.p.v. een open/write/close per melding.
+_DEBUG_ACTIEF = bool(os.environ.get("FV_DEBUG"))
+_debug_logger = logging.getLogger("factuurvergelijker.excel_debug")
+if _DEBUG_ACTIEF and not _debug_logger.handlers:
+    _debug_logger.setLevel(logging.DEBUG)
+    _debug_logger.propagate = False
+    _debug_logger.addHandler(logging.FileHandler('/tmp/excel_debug.log'))
+    _debug_logger.addHandler(logging.StreamHandler(sys.stdout))
+
+# Kleur van de statuscel in de details-sheet (kleurnaam voor _get_fill_color)
+STATUS_KLEUREN = {
+    config.STATUS_OK: 'green',
+    config.STATUS_AFWIJKING: 'orange',
+    config.STATUS_ONTBREEKT_FACTUUR: 'red',
+    config.STATUS_ONTBREEKT_SYSTEEM: 'red',
+    config.STATUS_GEDEELTELIJK: 'yellow',
+    config.STATUS_FOUT: 'gray',
+}
+
+# Vaste volgorde van statussen in samenvatting['counts_array']
+STATUS_VOLGORDE = [
+    config.STATUS_OK,
+    config.STATUS_AFWIJKING,
+    config.STATUS_ONTBREEKT_FACTUUR,
+    config.STATUS_ONTBREEKT_SYSTEEM,
+    config.STATUS_GEDEELTELIJK,
+    config.STATUS_FOUT
+]
+
+
 def genereer_samenvatting(df_resultaat: pd.DataFrame) -> Dict:
     """
     Genereert samenvattende statistieken van het vergelijkingsresultaat.
@@ -62,7 +96,8 @@ def genereer_samenvatting(df_resultaat: pd.DataFrame) -> Dict:
                 'ONTBREEKT IN SYSTEEM': int,
                 'GEDEELTELIJK': int,
                 'FOUT': int
-            }
+            },
+            'counts_array': np.ndarray  # aantallen in volgorde van STATUS_VOLGORDE
         }
     
     Voorbeelden
@@ -77,26 +112,17 @@ def genereer_samenvatting(df_resultaat: pd.DataFrame) -> Dict:
     # Tel totaal aantal regels
     totaal_regels = len(df_resultaat)
     
-    # Tel per status
-    status_counts = df_resultaat['status'].value_counts().to_dict()
-    
-    # Vul ontbrekende statussen aan met 0
-    alle_statussen = [
-        config.STATUS_OK,
-        config.STATUS_AFWIJKING,
-        config.STATUS_ONTBREEKT_FACTUUR,
-        config.STATUS_ONTBREEKT_SYSTEEM,
-        config.STATUS_GEDEELTELIJK,
-        config.STATUS_FOUT
-    ]
+    # Tel per status (één keer), ontbrekende statussen → 0
+    tellingen = df_resultaat['status'].value_counts()
+    counts_array = tellingen.reindex(STATUS_VOLGORDE, fill_value=0).to_numpy()
     
-    for status in alle_statussen:
-        if status not in status_counts:
-            status_counts[status] = 0
+    status_counts = tellingen.to_dict()
+    status_counts.update(zip(STATUS_VOLGORDE, counts_array.tolist()))
     
     samenvatting = {
         'totaal_regels': totaal_regels,
-        'status_counts': status_counts
+        'status_counts': status_counts,
+        'counts_array': counts_array
     }
     
     return samenvatting
@@ -156,28 +182,78 @@ def exporteer_naar_excel(
     ... )
     """
 
-    # ✨ DEBUG: Schrijf naar bestand
-    import sys
-    debug_msg = f"\n{'='*60}\n"
-    debug_msg += f"📥 REPORTER.exporteer_naar_excel() ONTVANGEN:\n"
-    debug_msg += f"   Aantal rijen: {len(df_resultaat)}\n"
-    debug_msg += f"   Shape: {df_resultaat.shape}\n"
-    debug_msg += f"{'='*60}\n"
-
-    with open('/tmp/excel_debug.log', 'a') as f:
-        f.write(debug_msg)
-    sys.stdout.write(debug_msg)
-    sys.stdout.flush()
+    # ✨ DEBUG (alleen met FV_DEBUG)
+    _debug_logger.debug(
+        "%s\n📥 REPORTER.exporteer_naar_excel() ONTVANGEN:\n"
+        "   Aantal rijen: %d\n   Shape: %s\n%s",
+        '=' * 60, len(df_resultaat), df_resultaat.shape, '=' * 60
+    )
 
-    # Genereer bestandsnaam met timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    bestandsnaam = f"vergelijking_{bestandsnaam_systeem}_vs_{bestandsnaam_factuur}_{timestamp}.xlsx"
-    
-    volledig_pad = output_pad / bestandsnaam
+    volledig_pad = output_pad / _excel_bestandsnaam(bestandsnaam_systeem, bestandsnaam_factuur)
     
     # Zorg dat output directory bestaat
     output_pad.mkdir(parents=True, exist_ok=True)
     
+    # Maak en sla op
+    workbook = _bouw_workbook(df_resultaat, aggregatie_systeem, aggregatie_leverancier)
+    workbook.save(volledig_pad)
+    
+    return volledig_pad
+
+
+def exporteer_naar_excel_bytes(
+    df_resultaat: pd.DataFrame,
+    bestandsnaam_systeem: str = "systeem",
+    bestandsnaam_factuur: str = "factuur",
+    aggregatie_systeem: Optional['AggregatieResultaat'] = None,
+    aggregatie_leverancier: Optional['AggregatieResultaat'] = None
+) -> Tuple[bytes, str]:
+    """
+    Als exporteer_naar_excel, maar schrijft naar geheugen in plaats van naar schijf.
+
+    Bedoeld voor de download-knop in de app: geen tijdelijk bestand dat
+    eerst geschreven en daarna weer ingelezen moet worden.
+
+    Parameters
+    ----------
+    df_resultaat : pd.DataFrame
+        Resultaat-DataFrame van comparator.py.
+    bestandsnaam_systeem, bestandsnaam_factuur, aggregatie_systeem, aggregatie_leverancier
+        Zie exporteer_naar_excel.
+
+    Returns
+    -------
+    tuple (bytes, str)
+        Inhoud van het .xlsx-bestand en de voorgestelde bestandsnaam.
+
+    Voorbeelden
+    -----------
+    >>> inhoud, naam = exporteer_naar_excel_bytes(resultaat_df, "export_jan", "factuur_A")
+    >>> naam
+    'vergelijking_export_jan_vs_factuur_A_20250101_120000.xlsx'
+    """
+    bestandsnaam = _excel_bestandsnaam(bestandsnaam_systeem, bestandsnaam_factuur)
+
+    buffer = io.BytesIO()
+    workbook = _bouw_workbook(df_resultaat, aggregatie_systeem, aggregatie_leverancier)
+    workbook.save(buffer)
+
+    return buffer.getvalue(), bestandsnaam
+
+
+def _excel_bestandsnaam(bestandsnaam_systeem: str, bestandsnaam_factuur: str) -> str:
+    """Bestandsnaam van het rapport, met timestamp."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"vergelijking_{bestandsnaam_systeem}_vs_{bestandsnaam_factuur}_{timestamp}.xlsx"
+
+
+def _bouw_workbook(
+    df_resultaat: pd.DataFrame,
+    aggregatie_systeem: Optional['AggregatieResultaat'] = None,
+    aggregatie_leverancier: Optional['AggregatieResultaat'] = None
+) -> Workbook:
+    """Bouwt het workbook met tabbladen Samenvatting en Details."""
+    
     # Genereer samenvatting
     samenvatting = genereer_samenvatting(df_resultaat)
     
@@ -201,10 +277,7 @@ def exporteer_naar_excel(
     ws_details = workbook.create_sheet(config.EXCEL_SHEET_NAAM)
     _schrijf_details_sheet(ws_details, df_resultaat)
     
-    # Sla op
-    workbook.save(volledig_pad)
-    
-    return volledig_pad
+    return workbook
 
 
 def _schrijf_samenvatting_sheet(
@@ -384,16 +457,12 @@ def _schrijf_details_sheet(worksheet, df_resultaat: pd.DataFrame):
         Resultaat-DataFrame met alle details.
     """
 
-    # ✨ DEBUG: Schrijf naar bestand
-    import sys
-    debug_msg = f"📊 _schrijf_details_sheet ONTVANGEN: {len(df_resultaat)} rijen\n"
-    debug_msg += f"   DataFrame shape: {df_resultaat.shape}\n"
-    debug_msg += f"   Kolommen: {list(df_resultaat.columns)}\n"
-
-    with open('/tmp/excel_debug.log', 'a') as f:
-        f.write(debug_msg)
-    sys.stdout.write(debug_msg)
-    sys.stdout.flush()
+    # ✨ DEBUG (alleen met FV_DEBUG)
+    _debug_logger.debug(
+        "📊 _schrijf_details_sheet ONTVANGEN: %d rijen\n"
+        "   DataFrame shape: %s\n   Kolommen: %s",
+        len(df_resultaat), df_resultaat.shape, list(df_resultaat.columns)
+    )
 
     # Schrijf DataFrame naar sheet
     rijen_geschreven = 0
@@ -408,19 +477,13 @@ def _schrijf_details_sheet(worksheet, df_resultaat: pd.DataFrame):
                 cell.alignment = Alignment(horizontal='center')
         rijen_geschreven = r_idx
 
-    debug_msg = f"📝 Aantal rijen GESCHREVEN naar Excel: {rijen_geschreven} (inclusief header)\n"
-    with open('/tmp/excel_debug.log', 'a') as f:
-        f.write(debug_msg)
-    sys.stdout.write(debug_msg)
-    sys.stdout.flush()
+    _debug_logger.debug("📝 Aantal rijen GESCHREVEN naar Excel: %d (inclusief header)", rijen_geschreven)
 
     # Kleurcodering voor status kolom
     status_col_idx = df_resultaat.columns.get_loc('status') + 1
-    debug_msg = f"🎨 Status kolom index: {status_col_idx}\n"
-    with open('/tmp/excel_debug.log', 'a') as f:
-        f.write(debug_msg)
-    sys.stdout.write(debug_msg)
-    sys.stdout.flush()
+    _debug_logger.debug("🎨 Status kolom index: %d", status_col_idx)
+
+    status_fills = {status: _get_fill_color(kleur) for status, kleur in STATUS_KLEUREN.items()}
 
     aantal_gekleurd = 0
     for rij_idx in range(2, len(df_resultaat) + 2):  # Start na header
@@ -428,32 +491,15 @@ def _schrijf_details_sheet(worksheet, df_resultaat: pd.DataFrame):
         status_waarde = status_cell.value
 
         # ✨ DEBUG: Print eerste 3 en laatste 3 statussen
-        if rij_idx <= 4 or rij_idx >= len(df_resultaat) - 1:
-            debug_msg = f"   Rij {rij_idx}: status = '{status_waarde}'\n"
-            with open('/tmp/excel_debug.log', 'a') as f:
-                f.write(debug_msg)
+        if _DEBUG_ACTIEF and (rij_idx <= 4 or rij_idx >= len(df_resultaat) - 1):
+            _debug_logger.debug("   Rij %d: status = '%s'", rij_idx, status_waarde)
 
-        if status_waarde == config.STATUS_OK:
-            status_cell.fill = _get_fill_color('green')
-            aantal_gekleurd += 1
-        elif status_waarde == config.STATUS_AFWIJKING:
-            status_cell.fill = _get_fill_color('orange')
-            aantal_gekleurd += 1
-        elif status_waarde in [config.STATUS_ONTBREEKT_FACTUUR, config.STATUS_ONTBREEKT_SYSTEEM]:
-            status_cell.fill = _get_fill_color('red')
-            aantal_gekleurd += 1
-        elif status_waarde == config.STATUS_GEDEELTELIJK:
-            status_cell.fill = _get_fill_color('yellow')
-            aantal_gekleurd += 1
-        elif status_waarde == config.STATUS_FOUT:
-            status_cell.fill = _get_fill_color('gray')
+        fill = status_fills.get(status_waarde)
+        if fill is not None:
+            status_cell.fill = fill
             aantal_gekleurd += 1
 
-    debug_msg = f"✅ Aantal cellen GEKLEURD: {aantal_gekleurd} van {len(df_resultaat)}\n"
-    with open('/tmp/excel_debug.log', 'a') as f:
-        f.write(debug_msg)
-    sys.stdout.write(debug_msg)
-    sys.stdout.flush()
+    _debug_logger.debug("✅ Aantal cellen GEKLEURD: %d van %d", aantal_gekleurd, len(df_resultaat))
     
     # Autofilter toevoegen
     worksheet.auto_filter.ref = worksheet.dimensions
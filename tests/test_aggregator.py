@@ -304,6 +304,37 @@ class TestPrijsInconsistentieDetectie:
         assert len(warnings) == 1
         assert 'A123' in warnings[0]
 
+    def test_geen_warning_zonder_herhaalde_artikelen(self):
+        """Elk artikel op één regel → geen warnings (check wordt overgeslagen)."""
+        df = pd.DataFrame({
+            'artikelcode': ['A123', 'B456', None],
+            'artikelnaam': ['Widget', 'Gadget', 'Bout M8'],
+            'aantal': [10.0, 5.0, 3.0],
+            'prijs_per_stuk': [5.00, 5.50, 10.00],
+            'totaal': [50.0, 27.5, 30.0],
+            'btw_percentage': [21.0, 21.0, 21.0]
+        })
+
+        assert _detecteer_prijs_inconsistenties(df) == []
+
+    def test_prijs_inconsistentie_zonder_naam(self):
+        """Artikel zonder naam geeft een warning in plaats van een IndexError."""
+        df = pd.DataFrame({
+            'artikelcode': ['A123', 'A123', 'A123'],
+            'artikelnaam': [None, None, None],
+            'aantal': [10.0, 5.0, 1.0],
+            'prijs_per_stuk': [5.50, 5.00, 5.50],
+            'totaal': [55.0, 25.0, 5.5],
+            'btw_percentage': [21.0, 21.0, 21.0]
+        })
+
+        warnings = _detecteer_prijs_inconsistenties(df)
+
+        assert warnings == [
+            "Artikel A123 (zonder naam) heeft verschillende prijzen tussen "
+            "documenten (€5.00, €5.50). Gemiddelde prijs gebruikt."
+        ]
+
 
 # ============================================================================
 # TESTS: EDGE CASES
@@ -0,0 +1,309 @@
+# test_comparator.py
+# Unit tests voor comparator.py
+
+"""
+Unit tests voor matching en vergelijking.
+
+Test coverage:
+- Status per gematcht paar (OK, AFWIJKING, GEDEELTELIJK)
+- Netto bedrag leidend, korting-detectie
+- Ontbrekende regels aan beide kanten
+- Kernel-uitkomst gelijk aan vergelijk_regel
+- Matching: code eerst, naam als fallback, dubbele codes op volgorde
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Voeg parent directory toe
+sys.path.append(str(Path(__file__).parent.parent))
+
+from modules.comparator import (
+    vergelijk_facturen,
+    match_regels,
+    vergelijk_regel,
+    _compare_kernel,
+    _korting_percentage,
+    _korting_percentage_kolom,
+    _koppel_op_volgorde
+)
+from modules.aggregator import aggregeer_documenten
+import config
+
+
+def _maak_df(regels):
+    """Bouwt een canoniek DataFrame uit (code, naam, aantal, prijs, totaal)-tuples."""
+    return pd.DataFrame(
+        [
+            {
+                'artikelcode': code,
+                'artikelnaam': naam,
+                'aantal': aantal,
+                'prijs_per_stuk': prijs,
+                'totaal': totaal,
+                'btw_percentage': 21.0
+            }
+            for code, naam, aantal, prijs, totaal in regels
+        ],
+        columns=['artikelcode', 'artikelnaam', 'aantal', 'prijs_per_stuk',
+                 'totaal', 'btw_percentage']
+    )
+
+
+# ============================================================================
+# TESTS: STATUS GEMATCHTE REGELS
+# ============================================================================
+
+class TestVergelijkFacturen:
+    """Tests voor vergelijk_facturen op gematchte regels."""
+
+    def test_gelijke_regel_is_ok(self):
+        """Gelijk aantal en bedrag → OK."""
+        df = _maak_df([('A1', 'Widget', 2.0, 5.0, 10.0)])
+
+        resultaat = vergelijk_facturen(df, df.copy())
+
+        assert resultaat['status'].tolist() == [config.STATUS_OK]
+        assert resultaat['afwijking_toelichting'][0] == 'Aantal en bedrag komen overeen'
+
+    def test_aantal_en_bedrag_afwijking(self):
+        """Afwijkend aantal en bedrag → AFWIJKING met beide meldingen."""
+        df_sys = _maak_df([('A1', 'Widget', 2.0, 5.0, 10.0)])
+        df_fac = _maak_df([('A1', 'Widget', 3.0, 5.0, 15.0)])
+
+        resultaat = vergelijk_facturen(df_sys, df_fac)
+
+        assert resultaat['status'][0] == config.STATUS_AFWIJKING
+        assert resultaat['afwijking_toelichting'][0] == (
+            "Aantal wijkt af (systeem 2, factuur 3); "
+            "Bedrag wijkt af (systeem €10.00, factuur €15.00)"
+        )
+
+    def test_korting_met_gelijk_netto_bedrag_is_ok(self):
+        """Bruto prijs met korting, netto totaal gelijk → OK met kortingsmelding."""
+        df_sys = _maak_df([('A1', 'Widget', 10.0, 5.0, 45.0)])
+        df_fac = _maak_df([('A1', 'Widget', 10.0, 4.5, 45.0)])
+
+        resultaat = vergelijk_facturen(df_sys, df_fac)
+
+        assert resultaat['status'][0] == config.STATUS_OK
+        assert resultaat['afwijking_toelichting'][0] == (
+            "Bedrag komt overeen (korting toegepast: systeem 10%)"
+        )
+
+    def test_ontbrekend_aantal_is_gedeeltelijk(self):
+        """Zonder aantal aan één kant → GEDEELTELIJK."""
+        df_sys = _maak_df([('A1', 'Widget', None, 5.0, 10.0)])
+        df_fac = _maak_df([('A1', 'Widget', 2.0, 5.0, 10.0)])
+
+        resultaat = vergelijk_facturen(df_sys, df_fac)
+
+        assert resultaat['status'][0] == config.STATUS_GEDEELTELIJK
+
+    def test_ontbrekende_regels_beide_kanten(self):
+        """Niet-gematchte regels krijgen ONTBREEKT-status, afwijkingen bovenaan."""
+        df_sys = _maak_df([('A1', 'Widget', 2.0, 5.0, 10.0), ('B1', 'Bout', 1.0, 1.0, 1.0)])
+        df_fac = _maak_df([('A1', 'Widget', 4.0, 5.0, 20.0), ('C1', 'Moer', 1.0, 1.0, 1.0)])
+
+        resultaat = vergelijk_facturen(df_sys, df_fac)
+
+        assert resultaat['status'].tolist() == [
+            config.STATUS_AFWIJKING,
+            config.STATUS_ONTBREEKT_FACTUUR,
+            config.STATUS_ONTBREEKT_SYSTEEM,
+        ]
+
+    def test_ontbrekende_regels_met_niet_oplopende_index(self):
+        """Index-labels van niet-gematchte regels zijn geen rijposities."""
+        df_sys = _maak_df([(c, c.lower(), 1.0, 1.0, 1.0) for c in ['A', 'B', 'C']])
+        df_sys.index = [2, 1, 0]
+        df_fac = _maak_df([('X', 'x', 1.0, 1.0, 1.0)])
+
+        resultaat = vergelijk_facturen(df_sys, df_fac)
+
+        assert resultaat['artikelcode'].tolist() == ['A', 'B', 'C', 'X']
+
+    def test_ontbrekende_regels_na_aggregatie(self):
+        """Geaggregeerd document zonder regel met aantal 0 (index [1, 2]) werkt."""
+        df_doc = _maak_df([
+            ('A', 'a', 0.0, 1.0, 0.0),
+            ('B', 'b', 1.0, 1.0, 1.0),
+            ('C', 'c', 2.0, 1.0, 2.0),
+        ])
+        df_sys = aggregeer_documenten([df_doc], ['doc.pdf'], ['pakbon']).df_aggregaat
+        df_fac = _maak_df([('X', 'x', 1.0, 1.0, 1.0)])
+
+        resultaat = vergelijk_facturen(df_sys, df_fac)
+
+        assert resultaat['artikelcode'].tolist() == ['B', 'C', 'X']
+        assert resultaat['aantal_systeem'].tolist()[:2] == [1.0, 2.0]
+
+    def test_volgorde_binnen_status_blijft_behouden(self):
+        """Sortering op status is stabiel: gelijke status houdt de regelvolgorde."""
+        regels = [(f'A{i}', f'Artikel {i}', 1.0, 1.0, 1.0) for i in range(30)]
+        df_sys = _maak_df(regels)
+        df_fac = _maak_df([(c, n, 2.0 if i % 2 else 1.0, p, t) for i, (c, n, _, p, t) in enumerate(regels)])
+
+        resultaat = vergelijk_facturen(df_sys, df_fac)
+
+        afwijkend = resultaat[resultaat['status'] == config.STATUS_AFWIJKING]
+        assert afwijkend['artikelcode'].tolist() == [f'A{i}' for i in range(1, 30, 2)]
+        assert resultaat['artikelcode'].tolist()[15:] == [f'A{i}' for i in range(0, 30, 2)]
+
+
+# ============================================================================
+# TESTS: MATCHING
+# ============================================================================
+
+class TestMatchRegels:
+    """Tests voor match_regels."""
+
+    def test_dubbele_codes_op_volgorde(self):
+        """Dubbele codes matchen in volgorde; code (met spaties) gaat voor naam."""
+        df_sys = _maak_df([
+            ('A1', 'Widget', 1.0, 1.0, 1.0),
+            (' A1 ', 'Widget', 1.0, 1.0, 1.0),
+            ('A1', 'Widget', 1.0, 1.0, 1.0),
+            (None, '  BOUT m8', 1.0, 1.0, 1.0),
+        ])
+        df_fac = _maak_df([
+            ('X9', 'bout M8', 1.0, 1.0, 1.0),
+            ('A1', 'Iets anders', 1.0, 1.0, 1.0),
+            ('A1', 'Widget', 1.0, 1.0, 1.0),
+        ])
+
+        matches = match_regels(df_sys, df_fac)
+
+        assert matches['gematchte_regels'] == [(0, 1), (1, 2), (3, 0)]
+        assert matches['systeem_zonder_match'] == [2]
+        assert matches['factuur_zonder_match'] == []
+
+    def test_niet_gematcht_in_bestandsvolgorde(self):
+        """Niet-gematchte labels komen in volgorde van het bestand terug."""
+        df_sys = _maak_df([(c, None, 1.0, 1.0, 1.0) for c in ['Z', 'A1', 'Q', 'B']])
+        df_sys.index = ['r4', 'r1', 'r3', 'r2']
+        df_fac = _maak_df([('A1', None, 1.0, 1.0, 1.0)])
+
+        matches = match_regels(df_sys, df_fac)
+
+        assert matches['gematchte_regels'] == [('r1', 0)]
+        assert matches['systeem_zonder_match'] == ['r4', 'r3', 'r2']
+
+    def test_koppel_op_volgorde(self):
+        """k-de systeemregel ↔ k-de factuurregel per id; -1 matcht nooit."""
+        sys_ids = np.array([0, 1, 0, -1, 0, 2])
+        fac_ids = np.array([-1, 0, 1, 1, 0])
+
+        sys_pos, fac_pos = _koppel_op_volgorde(sys_ids, fac_ids)
+
+        assert list(zip(sys_pos.tolist(), fac_pos.tolist())) == [(0, 1), (1, 2), (2, 4)]
+
+    def test_koppel_op_volgorde_unieke_sleutels(self):
+        """Unieke ids (snelle route) geven dezelfde koppeling, -1 mag vaker voorkomen."""
+        sys_ids = np.array([3, -1, 0, 2, -1])
+        fac_ids = np.array([-1, 2, 3, 1, -1])
+
+        sys_pos, fac_pos = _koppel_op_volgorde(sys_ids, fac_ids)
+
+        assert list(zip(sys_pos.tolist(), fac_pos.tolist())) == [(0, 2), (3, 1)]
+
+    def test_naam_fallback_alleen_vrije_factuurregels(self):
+        """Factuurregel die op code gematcht is, is niet meer beschikbaar op naam."""
+        df_sys = _maak_df([(None, 'Widget', 1.0, 1.0, 1.0), ('A1', 'Bout', 1.0, 1.0, 1.0)])
+        df_fac = _maak_df([('A1', 'widget', 1.0, 1.0, 1.0)])
+
+        matches = match_regels(df_sys, df_fac)
+
+        assert matches['gematchte_regels'] == [(1, 0)]
+        assert matches['systeem_zonder_match'] == [0]
+
+
+# ============================================================================
+# TESTS: NUMERIEKE KERNEL
+# ============================================================================
+
+class TestCompareKernel:
+    """Tests voor de numerieke vergelijkingskernel."""
+
+    def test_kernel_statuscodes(self):
+        """NaN telt als ontbrekend, afwijking gaat voor ontbrekend."""
+        nan = np.nan
+        aantal_sys = np.array([1.0, 1.0, nan, nan])
+        aantal_fac = np.array([1.0, 2.0, 1.0, 1.0])
+        bedrag_sys = np.array([5.0, 5.0, 5.0, 5.0])
+        bedrag_fac = np.array([5.0, 5.0, 5.0, 9.0])
+
+        codes, aantal_afw, bedrag_afw = _compare_kernel(
+            aantal_sys, aantal_fac, bedrag_sys, bedrag_fac, 0.0, 0.01
+        )
+
+        statussen = [
+            [config.STATUS_AFWIJKING, config.STATUS_GEDEELTELIJK, config.STATUS_OK][c]
+            for c in codes
+        ]
+        assert statussen == [
+            config.STATUS_OK,
+            config.STATUS_AFWIJKING,
+            config.STATUS_GEDEELTELIJK,
+            config.STATUS_AFWIJKING,
+        ]
+        assert aantal_afw.tolist() == [False, True, False, False]
+        assert bedrag_afw.tolist() == [False, False, False, True]
+
+    def test_numba_kernel_gelijk_aan_numpy(self):
+        """Gecompileerde kernel (numba) geeft dezelfde uitkomst als de NumPy-versie."""
+        pytest.importorskip('numba')
+        from modules import comparator
+
+        assert comparator.NUMBA_AVAILABLE
+        rng = np.random.default_rng(0)
+        waarden = np.array([np.nan, 0.0, 1.0, 2.0, 2.004, 5.0, 10.0])
+        arrays = [rng.choice(waarden, 500) for _ in range(4)]
+
+        gecompileerd = comparator._compare_kernel(*arrays, 0.0, 0.01)
+        numpy_versie = comparator._compare_kernel.py_func(*arrays, 0.0, 0.01)
+
+        for a, b in zip(gecompileerd, numpy_versie):
+            assert a.dtype == b.dtype
+            np.testing.assert_array_equal(a, b)
+
+    def test_korting_kolom_gelijk_aan_per_regel(self):
+        """Kolomversie van de korting-detectie == _korting_percentage per regel."""
+        nan = np.nan
+        prijs = np.array([10.0, 10.0, 10.0, 0.0, 10.0, nan, 10.0])
+        aantal = np.array([2.0, 2.0, 2.0, 2.0, 0.0, 2.0, 2.0])
+        totaal = np.array([18.0, 20.0, 22.0, 5.0, 5.0, 5.0, nan])
+
+        resultaat = _korting_percentage_kolom(prijs, aantal, totaal)
+
+        for i in range(len(prijs)):
+            verwacht = _korting_percentage(prijs[i], aantal[i], totaal[i])
+            if verwacht is None:
+                assert np.isnan(resultaat[i])
+            else:
+                assert resultaat[i] == verwacht
+        assert resultaat[0] == 10.0
+
+    def test_kernel_gelijk_aan_vergelijk_regel(self):
+        """Vergelijking via vergelijk_facturen == vergelijk_regel per paar."""
+        df_sys = _maak_df([
+            ('A1', 'Widget', 2.0, 5.0, 10.0),
+            ('A2', 'Bout', 3.0, 2.0, None),
+            ('A3', 'Moer', 5.0, 2.0, 9.0),
+        ])
+        df_fac = _maak_df([
+            ('A1', 'Widget', 2.0, 5.0, 10.004),
+            ('A2', 'Bout', 3.0, 2.5, None),
+            ('A3', 'Moer', 5.0, None, 9.0),
+        ])
+
+        resultaat = vergelijk_facturen(df_sys, df_fac).set_index('artikelcode')
+
+        for i in range(len(df_sys)):
+            verwacht = vergelijk_regel(df_sys.iloc[i], df_fac.iloc[i])
+            rij = resultaat.loc[verwacht['artikelcode']]
+            assert rij['status'] == verwacht['status']
+            assert rij['afwijking_toelichting'] == verwacht['afwijking_toelichting']
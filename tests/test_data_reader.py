@@ -0,0 +1,163 @@
+# test_data_reader.py
+# Unit tests voor data_reader.py
+
+"""
+Unit tests voor het inlezen van CSV- en Excel-bestanden.
+
+Test coverage:
+- CSV uit in-memory buffer
+- Excel (.xlsx) herkend aan bestandsnaam van de buffer
+- Lege bestanden
+- Blokgewijs lezen met verwerk_deel gelijk aan in één keer lezen
+- pyarrow-route geeft hetzelfde DataFrame als pandas.read_csv
+"""
+
+import io
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Voeg parent directory toe
+sys.path.append(str(Path(__file__).parent.parent))
+
+import modules.data_reader as data_reader
+from modules.data_reader import lees_csv
+from modules.comparator import vergelijk_facturen
+import config
+from modules.normalizer import normaliseer_dataframe
+
+
+def _buffer(inhoud: bytes, naam: str) -> io.BytesIO:
+    """BytesIO met .name, zoals app.py uploads doorgeeft."""
+    buffer = io.BytesIO(inhoud)
+    buffer.name = naam
+    return buffer
+
+
+# ============================================================================
+# TESTS: LEES_CSV
+# ============================================================================
+
+class TestLeesCsv:
+    """Tests voor lees_csv op CSV- en Excel-buffers."""
+
+    def test_csv_buffer(self):
+        """CSV uit buffer → kolommen zonder voorloopspaties."""
+        df = lees_csv(_buffer(b"artikelcode, aantal\nA1, 2\nA2, 3\n", 'export.csv'))
+
+        assert df.columns.tolist() == ['artikelcode', 'aantal']
+        assert len(df) == 2
+
+    def test_excel_buffer(self):
+        """.xlsx-buffer wordt als Excel gelezen, niet als CSV."""
+        bron = pd.DataFrame({'artikelcode': ['A1', 'A2'], 'aantal': [2, 3]})
+        inhoud = io.BytesIO()
+        bron.to_excel(inhoud, index=False)
+
+        df = lees_csv(_buffer(inhoud.getvalue(), 'export.xlsx'))
+
+        assert df.columns.tolist() == ['artikelcode', 'aantal']
+        assert df['aantal'].tolist() == [2, 3]
+
+    def test_leeg_bestand(self):
+        """Lege upload → ValueError."""
+        with pytest.raises(ValueError):
+            lees_csv(_buffer(b"", 'leeg.csv'))
+
+    @pytest.mark.skipif(not data_reader.PYARROW_AVAILABLE, reason="pyarrow niet beschikbaar")
+    def test_blokgewijs_gelijk_aan_in_een_keer(self, monkeypatch):
+        """Grote CSV in blokken genormaliseerd == in één keer genormaliseerd."""
+        regels = ["Artikelcode,Omschrijving,Aantal,Prijs"]
+        regels += [f"A{i},  Bout  M{i % 7} ,{i % 5},{i * 0.25}" for i in range(5000)]
+        inhoud = "\n".join(regels).encode()
+        normaliseer = lambda deel: normaliseer_dataframe(deel, 'systeem')
+
+        verwacht = lees_csv(_buffer(inhoud, 'groot.csv'), verwerk_deel=normaliseer)
+
+        monkeypatch.setattr(data_reader, 'GROOT_CSV_BYTES', 1)
+        monkeypatch.setattr(data_reader, 'CSV_BLOK_BYTES', 4096)
+        resultaat = lees_csv(_buffer(inhoud, 'groot.csv'), verwerk_deel=normaliseer)
+
+        pd.testing.assert_frame_equal(resultaat, verwacht)
+
+
+# ============================================================================
+# TESTS: PYARROW GELIJK AAN PANDAS
+# ============================================================================
+
+# Lege velden, NA-teksten, lege kolom en ISO-datum: pyarrow leest zelf
+CSV_ZONDER_WITRUIMTE = (
+    b"code,naam,aantal,prijs,leeg,datum\n"
+    b"A1,Widget,3,4.5,,2024-01-05\n"
+    b",Gadget,3,4,,\n"
+    b"NA,n/a,,5,NA,2024-02-01\n"
+    b'"",NULL,2,,,\n'
+)
+
+# Spaties/tabs rond velden: alleen pandas (skipinitialspace) leest dit goed
+CSV_MET_WITRUIMTE = (
+    b"code, naam, aantal\n"
+    b" A1, Widget, 3\n"
+    b" , ,4\n"
+    b"\tB2, NA ,5 \n"
+)
+
+
+@pytest.mark.skipif(not data_reader.PYARROW_AVAILABLE, reason="pyarrow niet beschikbaar")
+class TestPyarrowGelijkAanPandas:
+    """pyarrow-routes moeten hetzelfde opleveren als _lees_csv_pandas."""
+
+    def test_lege_velden_en_na_teksten(self):
+        """Lege velden en 'NA'/'n/a'/'NULL' → NaN, ook in tekstkolommen."""
+        verwacht = data_reader._lees_csv_pandas(CSV_ZONDER_WITRUIMTE, 'x.csv')
+        resultaat = data_reader._lees_csv_pyarrow(CSV_ZONDER_WITRUIMTE)
+
+        assert resultaat is not None
+        pd.testing.assert_frame_equal(resultaat, verwacht)
+        assert resultaat['code'].isna().tolist() == [False, True, True, True]
+
+    def test_witruimte_rond_velden_via_pandas(self):
+        """Voorloopspaties / alleen-spatie velden → pyarrow geeft op, lees_csv == pandas."""
+        verwacht = data_reader._lees_csv_pandas(CSV_MET_WITRUIMTE, 'x.csv')
+
+        assert data_reader._lees_csv_pyarrow(CSV_MET_WITRUIMTE) is None
+        pd.testing.assert_frame_equal(lees_csv(_buffer(CSV_MET_WITRUIMTE, 'x.csv')), verwacht)
+        assert verwacht['naam'][0] == 'Widget'
+        assert pd.isna(verwacht['code'][1]) and pd.isna(verwacht['naam'][1])
+
+    def test_blokgewijs_gelijk_aan_pandas(self, monkeypatch):
+        """Blokroute (kleine blokken) == pandas, ook met lege velden en NA-teksten."""
+        regels = [CSV_ZONDER_WITRUIMTE.rstrip(b"\n")]
+        regels += [f"B{i},Bout {i % 7},{i % 5},{i * 0.25},,".encode() for i in range(3000)]
+        regels += [b",Gadget,3,4,,", b"NA,n/a,,5,NA,"]
+        inhoud = b"\n".join(regels) + b"\n"
+        verwacht = data_reader._lees_csv_pandas(inhoud, 'groot.csv')
+
+        monkeypatch.setattr(data_reader, 'CSV_BLOK_BYTES', 4096)
+        resultaat = data_reader._lees_csv_pyarrow_in_blokken(inhoud, lambda deel: deel)
+
+        assert resultaat is not None
+        pd.testing.assert_frame_equal(resultaat, verwacht)
+
+        monkeypatch.setattr(data_reader, 'GROOT_CSV_BYTES', 1)
+        assert data_reader._lees_csv_pyarrow_in_blokken(CSV_MET_WITRUIMTE, lambda deel: deel) is None
+        pd.testing.assert_frame_equal(
+            lees_csv(_buffer(CSV_MET_WITRUIMTE, 'x.csv'), verwerk_deel=lambda deel: deel),
+            data_reader._lees_csv_pandas(CSV_MET_WITRUIMTE, 'x.csv')
+        )
+
+    def test_lege_code_matcht_niet(self):
+        """Regel met lege artikelcode matcht niet op een andere lege code."""
+        kop = b"Artikelcode,Omschrijving,Aantal,Prijs\nA1,Widget,1,2\n"
+        for lege_code in (b",", b" ,"):
+            df_sys = normaliseer_dataframe(
+                lees_csv(_buffer(kop + lege_code + b"Gadget,3,4\n", 'systeem.csv')), 'systeem')
+            df_fac = normaliseer_dataframe(
+                lees_csv(_buffer(kop + lege_code + b"Doodad,1,9\n", 'factuur.csv')), 'factuur')
+
+            statussen = vergelijk_facturen(df_sys, df_fac)['status'].tolist()
+
+            assert sorted(statussen) == sorted([
+                config.STATUS_OK, config.STATUS_ONTBREEKT_SYSTEEM, config.STATUS_ONTBREEKT_FACTUUR
+            ])
@@ -0,0 +1,50 @@
+# test_formatter.py
+# Unit tests voor formatter.py
+
+"""
+Unit tests voor number formatting.
+
+Test coverage:
+- Kolom-formatters gelijk aan de formatters per waarde
+- NaN → lege string
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Voeg parent directory toe
+sys.path.append(str(Path(__file__).parent.parent))
+
+from modules.formatter import (
+    formatteer_aantal,
+    formatteer_prijs,
+    formatteer_aantal_kolom,
+    formatteer_prijs_kolom
+)
+
+
+# ============================================================================
+# TESTS: KOLOM-FORMATTERS
+# ============================================================================
+
+class TestKolomFormatters:
+    """Tests voor de gevectoriseerde formatters."""
+
+    WAARDEN = [10.0, 1.0, 0.99, 1234.56, -2.5, 1234567.891, 0.0, np.nan]
+
+    def test_aantal_kolom_gelijk_aan_per_waarde(self):
+        """formatteer_aantal_kolom == formatteer_aantal per cel."""
+        resultaat = formatteer_aantal_kolom(pd.Series(self.WAARDEN))
+
+        assert resultaat.tolist() == [formatteer_aantal(w) for w in self.WAARDEN]
+
+    def test_prijs_kolom_gelijk_aan_per_waarde(self):
+        """formatteer_prijs_kolom == formatteer_prijs per cel."""
+        resultaat = formatteer_prijs_kolom(pd.Series(self.WAARDEN))
+
+        assert resultaat.tolist() == [formatteer_prijs(w) for w in self.WAARDEN]
+        assert resultaat[3] == '€1.234,56'
+        assert resultaat[7] == ''
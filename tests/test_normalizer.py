@@ -0,0 +1,84 @@
+# test_normalizer.py
+# Unit tests voor normalizer.py
+
+"""
+Unit tests voor normalisatie.
+
+Test coverage:
+- Kolomversie van maak_genormaliseerde_naam gelijk aan versie per waarde
+- Kolomnamen herkennen via LEVERANCIERS_MAPPING
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Voeg parent directory toe
+sys.path.append(str(Path(__file__).parent.parent))
+
+import config
+from modules.normalizer import (
+    maak_genormaliseerde_naam,
+    maak_genormaliseerde_naam_kolom,
+    map_kolomnaam,
+    map_kolommen
+)
+
+
+# ============================================================================
+# TESTS: GENORMALISEERDE NAAM
+# ============================================================================
+
+class TestGenormaliseerdeNaamKolom:
+    """Tests voor maak_genormaliseerde_naam_kolom."""
+
+    def test_gelijk_aan_per_waarde(self):
+        """Zelfde uitkomst als maak_genormaliseerde_naam, ook voor None/NaN/getallen."""
+        namen = ["  Laptop  DELL  ", "Moer\tM6\n", "CAFÉ\xa0Crème", "", None, np.nan, 123]
+        resultaat = maak_genormaliseerde_naam_kolom(pd.Series(namen, dtype=object))
+
+        assert resultaat.tolist() == [maak_genormaliseerde_naam(n) for n in namen]
+        assert resultaat.tolist()[:3] == ['laptop dell', 'moer m6', 'café crème']
+
+    def test_herhaalde_en_numerieke_namen(self):
+        """Herhaalde namen en 1/1.0/True (gelijk als hash) blijven per cel correct."""
+        namen = ["Bout  M8", 1, "bout m8", 1.0, True, "Bout  M8", None, 1]
+        resultaat = maak_genormaliseerde_naam_kolom(pd.Series(namen, dtype=object))
+
+        assert resultaat.tolist() == [maak_genormaliseerde_naam(n) for n in namen]
+        assert resultaat.tolist()[1:5] == ['1', 'bout m8', '1.0', 'true']
+
+    def test_index_behouden(self):
+        """Resultaat heeft dezelfde index als de invoer."""
+        namen = pd.Series(["A", "b  B"], index=[7, 3])
+
+        assert maak_genormaliseerde_naam_kolom(namen).to_dict() == {7: 'a', 3: 'b b'}
+
+
+# ============================================================================
+# TESTS: KOLOMMAPPING
+# ============================================================================
+
+class TestKolomMapping:
+    """Tests voor map_kolomnaam en map_kolommen."""
+
+    def test_map_kolomnaam(self):
+        """Hoofdletters en spaties maken niet uit; onbekend → None."""
+        assert map_kolomnaam("  Omschrijving ") == config.CANON_ARTIKELNAAM
+        assert map_kolomnaam("BTW%") == config.CANON_BTW
+        assert map_kolomnaam("opmerking") is None
+
+    def test_map_kolommen_laat_onbekende_kolommen_staan(self):
+        """Herkende kolommen worden hernoemd, overige blijven ongewijzigd."""
+        df = pd.DataFrame(columns=["Code", "Qty", "Opmerking"])
+
+        assert map_kolommen(df).columns.tolist() == [
+            config.CANON_ARTIKELCODE, config.CANON_AANTAL, "Opmerking"
+        ]
+
+    def test_mapping_alleen_lezen(self):
+        """LEVERANCIERS_MAPPING kan niet per ongeluk aangepast worden."""
+        with pytest.raises(TypeError):
+            config.LEVERANCIERS_MAPPING["nieuw"] = config.CANON_AANTAL
@@ -0,0 +1,81 @@
+# test_pdf_cache.py
+# Unit tests voor pdf_cache.py
+
+"""
+Unit tests voor de schijfcache van PDF-resultaten.
+
+Test coverage:
+- DataFrame en classificatie heen en terug
+- Sleutel hangt af van inhoud en onderdelen
+- LRU-opruiming boven CACHE_MAX_BESTANDEN
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Voeg parent directory toe
+sys.path.append(str(Path(__file__).parent.parent))
+
+from modules import pdf_cache
+from modules.pdf_classifier import PDFClassificatieResultaat
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Cache in een tijdelijke map per test."""
+    monkeypatch.setattr(pdf_cache, 'CACHE_DIR', tmp_path)
+    return tmp_path
+
+
+def _classificatie():
+    return PDFClassificatieResultaat(
+        type='template_herkend',
+        leverancier='Bosal',
+        tekst_lengte=1200,
+        heeft_tabel_structuur=True,
+        bericht_gebruiker='Leverancier herkend'
+    )
+
+
+# ============================================================================
+# TESTS: PDF CACHE
+# ============================================================================
+
+class TestPdfCache:
+    """Tests voor opslaan, laden en opruimen."""
+
+    @pytest.mark.skipif(not pdf_cache.PARQUET_AVAILABLE, reason="pyarrow niet beschikbaar")
+    def test_dataframe_heen_en_terug(self, cache_dir):
+        """Opgeslagen DataFrame komt ongewijzigd terug."""
+        df = pd.DataFrame({
+            'artikelcode': ['A1', 'B2'],
+            'aantal': [2.0, np.nan],
+            'totaal': [10.0, 4.5]
+        })
+        sleutel = pdf_cache.cache_sleutel(b'%PDF factuur', 'Bosal')
+
+        assert pdf_cache.laad_dataframe(sleutel) is None
+        pdf_cache.bewaar_dataframe(sleutel, df)
+
+        pd.testing.assert_frame_equal(pdf_cache.laad_dataframe(sleutel), df)
+
+    def test_classificatie_heen_en_terug(self, cache_dir):
+        """Classificatie-dataclass komt gelijk terug; andere inhoud → geen treffer."""
+        sleutel = pdf_cache.cache_sleutel(b'%PDF factuur', 'pdf')
+        pdf_cache.bewaar_classificatie(sleutel, _classificatie())
+
+        assert pdf_cache.laad_classificatie(sleutel, PDFClassificatieResultaat) == _classificatie()
+        andere = pdf_cache.cache_sleutel(b'%PDF andere factuur', 'pdf')
+        assert pdf_cache.laad_classificatie(andere, PDFClassificatieResultaat) is None
+
+    def test_opruimen_boven_maximum(self, cache_dir, monkeypatch):
+        """Niet meer dan CACHE_MAX_BESTANDEN bestanden blijven staan."""
+        monkeypatch.setattr(pdf_cache, 'CACHE_MAX_BESTANDEN', 3)
+
+        for i in range(6):
+            pdf_cache.bewaar_classificatie(pdf_cache.cache_sleutel(bytes([i])), _classificatie())
+
+        assert len(list(cache_dir.iterdir())) == 3